@@ -16,12 +16,25 @@ rm -rf ../grid_csc/test_vectors
 rm -rf ../grid_csr/test_vectors
 rm -rf ../grid_coo/test_vectors
 rm -rf ../grid_ellpack/test_vectors
+rm -rf ../grid_hyb/test_vectors
+rm -rf ../grid_sell/test_vectors
+rm -rf ../grid_bsr/test_vectors
+rm -rf ../grid_dcsr/test_vectors
+rm -rf ../grid_dcsc/test_vectors
+rm -rf ../grid_bitmap/test_vectors
+rm -rf ../grid_nm/test_vectors
 
 testlen=${#A_heights[@]}
 
-for (( i=0; i<${testlen}; i++ ));
+# Every format is tested with 32-bit values and indices, packed 16-bit indices and fp16 values (index and value bits),
+# the last configurations drop the values of A in the formats that support pattern-only matrices and delta-encode the
+# column indices of CSR and ELLPACK
+for widths in "32 32" "16 32" "32 16" "32 32 1" "32 32 0 1"
 do
-  ./run_test.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} 
+  for (( i=0; i<${testlen}; i++ ));
+  do
+    ./run_test.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $widths
+  done
 done
 
 
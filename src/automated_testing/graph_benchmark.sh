@@ -0,0 +1,36 @@
+#!/usr/bin/env bash
+
+# Benchmarks every sparse grid format on the power-law matrices of the graph generators and the structured matrices
+# Usage: ./graph_benchmark.sh [generators...] (default: all graph and structured generators)
+# Set BALANCE=1 to benchmark the nnz-balanced permutations of the matrices
+# Set EQUALIZE=<extent ratio> to benchmark the nnz-equalizing tile boundaries (e.g. EQUALIZE=1.5)
+# Set INDEX_BITS=16 to pack two indices of A into every word on the device
+# Set VALUE_BITS=16 to store the values of A and B in fp16 on the device
+# Set PATTERN_ONLY=1 to drop the values of A, only CSC, CSR, COO and ELLPACK are benchmarked then
+# Set DELTA_INDICES=1 to store the column indices of A as bit-packed deltas, only CSR and ELLPACK are benchmarked then
+
+set -x
+set -e
+
+generators=("$@")
+if [ ${#generators[@]} -eq 0 ]; then
+  generators=("rmat" "kronecker" "chung-lu" "banded" "stencil5" "stencil7" "stencil27" "block-diagonal" "nm")
+fi
+
+format_dirs=("grid_csc" "grid_csr" "grid_coo" "grid_ellpack" "grid_hyb" "grid_sell" "grid_bsr" "grid_dcsr" "grid_dcsc" "grid_bitmap" "grid_nm")
+if [ "${PATTERN_ONLY:-0}" == "1" ]; then
+  format_dirs=("grid_csc" "grid_csr" "grid_coo" "grid_ellpack")
+fi
+if [ "${DELTA_INDICES:-0}" == "1" ]; then
+  format_dirs=("grid_csr" "grid_ellpack")
+fi
+
+for generator in "${generators[@]}"
+do
+  for format_dir in "${format_dirs[@]}"
+  do
+    cd ../$format_dir
+    ./full_benchmark.sh $generator "" ${BALANCE:-0} ${EQUALIZE:-0} ${INDEX_BITS:-32} ${VALUE_BITS:-32} ${PATTERN_ONLY:-0} ${DELTA_INDICES:-0}
+    cd ../automated_testing
+  done
+done
@@ -9,6 +9,14 @@ A_density=$3
 grid_height=$4
 grid_width=$5
 M_width=$6
+# Optional: width of the index entries of A on the device (16 or 32), GEMM has no indices
+index_bits=${7:-32}
+# Optional: width of the values of A and B on the device (16 or 32)
+value_bits=${8:-32}
+# Optional: 1 drops the values of A, every entry is one (only CSC, CSR, COO and ELLPACK, the other formats keep their values)
+pattern_only=${9:-0}
+# Optional: 1 stores the column indices of A as bit-packed deltas (only CSR and ELLPACK, the other formats keep their indices)
+delta_indices=${10:-0}
 
 # Initialize test directories
 mkdir ../gemm/test_vectors
@@ -16,13 +24,33 @@ mkdir ../grid_csc/test_vectors
 mkdir ../grid_csr/test_vectors
 mkdir ../grid_coo/test_vectors
 mkdir ../grid_ellpack/test_vectors
+mkdir ../grid_hyb/test_vectors
+mkdir ../grid_sell/test_vectors
+mkdir ../grid_bsr/test_vectors
+mkdir ../grid_dcsr/test_vectors
+mkdir ../grid_dcsc/test_vectors
+mkdir ../grid_bitmap/test_vectors
+mkdir ../grid_nm/test_vectors
 
-for i in 0 1 2 3
+format_dirs=("grid_csc" "grid_csr" "grid_coo" "grid_ellpack" "grid_hyb" "grid_sell" "grid_bsr" "grid_dcsr" "grid_dcsc" "grid_bitmap" "grid_nm")
+
+for i in 0 1 2 3 4 5 6 7 8 9 10
 do
     cd ../sparse_format_convertors
-    # Generate A matrix
-    ./a.out $A_height $A_width $A_density $grid_height $grid_width $i
-    OUTPUT=($(python3 add_padding.py ${i}| tr -d '[],')) # Evaluate output from python script as an array of numbers
+    # Fetch A in padded grid format from the test vector cache (only generated on a cache miss), GEMM reuses the CSC vectors
+    test_dirs="../${format_dirs[i]}/test_vectors"
+    if [ $i -eq 0 ]; then
+        test_dirs="$test_dirs ../gemm/test_vectors"
+    fi
+    pattern_flag=""
+    if [ "$pattern_only" == "1" ] && [ $i -le 3 ]; then
+        pattern_flag="-pattern_only"
+    fi
+    delta_flag=""
+    if [ "$delta_indices" == "1" ] && ( [ $i -eq 1 ] || [ $i -eq 3 ] ); then
+        delta_flag="-delta_indices"
+    fi
+    OUTPUT=($(python3 vector_cache.py $A_height $A_width $A_density $grid_height $grid_width $i 0 $test_dirs $pattern_flag $delta_flag | tr -d '[],')) # Evaluate output from python script as an array of numbers
     
     #SDK 0.6.0 requires fabrics dimensions: dim_x >= x + width + 3 + width-east-buf, dim_y >= y + height + 1.
     case $i in
@@ -31,14 +59,10 @@ do
         val_len=${OUTPUT[2]} 
         row_idx_len=${OUTPUT[6]}
         col_ptr_len=${OUTPUT[10]}
-        mv tmp_*_pad.csv ../grid_csc/test_vectors
-        cp tmp.csv ../gemm/test_vectors
-        mv tmp.csv ../grid_csc/test_vectors
-        rm tmp*
         cd ../grid_csc
 
-        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_rowidx_len:$row_idx_len,A_colptr_len:$col_ptr_len,LAUNCH_ID:4 -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
-        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_rowidx_len:$row_idx_len,A_colptr_len:$col_ptr_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits,pattern_only:$pattern_only -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
 
         # remove CSC run
         rm simfab_traces/ -rf
@@ -58,13 +82,11 @@ do
         val_len=${OUTPUT[2]} 
         col_idx_len=${OUTPUT[6]}
         row_ptr_len=${OUTPUT[10]}
-        mv tmp_*_pad.csv ../grid_csr/test_vectors
-        mv tmp.csv ../grid_csr/test_vectors
-        rm tmp*
+        delta_bits=${OUTPUT[13]:-0}
         cd ../grid_csr
 
-        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_colidx_len:$col_idx_len,A_rowptr_len:$row_ptr_len,LAUNCH_ID:4 -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
-        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_colidx_len:$col_idx_len,A_rowptr_len:$row_ptr_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits,pattern_only:$pattern_only,delta_bits:$delta_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
 
         # remove run
         rm simfab_traces/ -rf
@@ -75,13 +97,10 @@ do
         val_len=${OUTPUT[2]} 
         col_len=${OUTPUT[6]}
         row_len=${OUTPUT[10]}
-        mv tmp_*_pad.csv ../grid_coo/test_vectors
-        mv tmp.csv ../grid_coo/test_vectors
-        rm tmp*
         cd ../grid_coo
 
-        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_len:$(($val_len+1)),LAUNCH_ID:4 -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
-        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_len:$(($val_len+1)),LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits,pattern_only:$pattern_only -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
 
         # remove run
         rm simfab_traces/ -rf
@@ -90,13 +109,111 @@ do
 
     3)  
         val_len=${OUTPUT[2]} 
-        mv tmp_*_pad.csv ../grid_ellpack/test_vectors
-        mv tmp.csv ../grid_ellpack/test_vectors
-        rm tmp*
+        fields_len=${OUTPUT[5]}
+        delta_bits=${OUTPUT[8]:-0}
         cd ../grid_ellpack
 
-        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_len:$val_len,LAUNCH_ID:4 -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
-        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_len:$val_len,A_fields_len:$fields_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits,pattern_only:$pattern_only,delta_bits:$delta_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    4)  
+        ell_len=${OUTPUT[3]} 
+        coo_len=${OUTPUT[11]}
+        cd ../grid_hyb
+
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_ell_len:$ell_len,A_coo_len:$coo_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    5)  
+        val_len=${OUTPUT[2]} 
+        slice_height=$((${OUTPUT[13]} / ${OUTPUT[9]}))
+        cd ../grid_sell
+
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_len:$val_len,slice_height:$slice_height,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    6)  
+        val_len=${OUTPUT[2]} 
+        col_idx_len=${OUTPUT[7]}
+        row_ptr_len=${OUTPUT[12]}
+        block_rows=$(($A_height / $grid_height / ($row_ptr_len - 1)))
+        block_cols=$(($val_len / ($col_idx_len * $block_rows)))
+        cd ../grid_bsr
+
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_colidx_len:$col_idx_len,A_rowptr_len:$row_ptr_len,block_rows:$block_rows,block_cols:$block_cols,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    7)  
+        val_len=${OUTPUT[2]} 
+        col_idx_len=${OUTPUT[6]}
+        row_ids_len=${OUTPUT[10]}
+        row_ptr_len=${OUTPUT[14]}
+        cd ../grid_dcsr
+
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_colidx_len:$col_idx_len,A_rowids_len:$row_ids_len,A_rowptr_len:$row_ptr_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    8)  
+        val_len=${OUTPUT[2]} 
+        row_idx_len=${OUTPUT[6]}
+        col_ids_len=${OUTPUT[10]}
+        col_ptr_len=${OUTPUT[14]}
+        cd ../grid_dcsc
+
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_rowidx_len:$row_idx_len,A_colids_len:$col_ids_len,A_colptr_len:$col_ptr_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    9)  
+        val_len=${OUTPUT[2]} 
+        bitmap_len=${OUTPUT[5]}
+        cd ../grid_bitmap
+
+        # The bitmap has no index arrays, only the value width applies
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_bitmap_len:$bitmap_len,LAUNCH_ID:4,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -value_bits=$value_bits
+
+        # remove run
+        rm simfab_traces/ -rf
+        rm out/ -rf
+        ;;
+
+    10)  
+        # The offsets have the length of the values, the pattern is read on the device
+        val_len=${OUTPUT[2]} 
+        cd ../grid_nm
+
+        cslc ./layout.csl --fabric-dims=$(($grid_width + 7)),$(($grid_height + 2)) --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+        cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
 
         # remove run
         rm simfab_traces/ -rf
@@ -115,5 +232,12 @@ rm -rf ../grid_csc/test_vectors
 rm -rf ../grid_csr/test_vectors
 rm -rf ../grid_coo/test_vectors
 rm -rf ../grid_ellpack/test_vectors
+rm -rf ../grid_hyb/test_vectors
+rm -rf ../grid_sell/test_vectors
+rm -rf ../grid_bsr/test_vectors
+rm -rf ../grid_dcsr/test_vectors
+rm -rf ../grid_dcsc/test_vectors
+rm -rf ../grid_bitmap/test_vectors
+rm -rf ../grid_nm/test_vectors
 
 
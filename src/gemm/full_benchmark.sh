@@ -10,5 +10,7 @@ testlen=${#A_heights[@]}
 for (( i=0; i<${testlen}; i++ ));
 do
   vector_path="CSC_${A_heights[i]}x${A_widths[i]}_${A_densities[i]}"
+  # Fetch the test vectors from the cache, the generation is skipped for configurations that are already cached
+  python3 ../sparse_format_convertors/vector_cache.py ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} 0 0 $vector_path > /dev/null
   ./run_benchmark.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $vector_path
 done
\ No newline at end of file
@@ -41,6 +41,7 @@ import subprocess
 import numpy as np
 import math
 import csv
+import sys
 
 from cerebras.sdk.runtime import runtime_utils # pylint: disable=no-name-in-module
 from cerebras.sdk.runtime.sdkruntimepybind import SdkRuntime # pylint: disable=no-name-in-module
@@ -53,6 +54,10 @@ BENCHMARKS_DIR = os.path.dirname(RESIDUAL_DIR)
 CSL_DIR = os.path.dirname(BENCHMARKS_DIR)
 CSLC = os.path.join(CSL_DIR, "build") + "/bin/cslc"
 
+# The tile store reader lives next to the sparse format convertors
+sys.path.append(os.path.join(BENCHMARKS_DIR, "sparse_format_convertors"))
+import tile_store # pylint: disable=wrong-import-position
+
 def split_matrix_into_grids(matrix, Nt, Kt):
     N, K = matrix.shape
     submatrices = []
@@ -255,8 +260,7 @@ def main():
   print(f"N = {N}, K = {K}, M = {M}, width = {width}, height = {height}")
 
   # Use this for reference solution
-  A_dense_format = file_dir+A_prefix+".csv"
-  A = np.genfromtxt(A_dense_format, delimiter=",", dtype=np.float32).reshape(N, K)
+  A = tile_store.load_dense(file_dir+A_prefix, N, K)
 
   np.random.seed(2)
   
@@ -0,0 +1,62 @@
+#!/usr/bin/env bash
+
+set -x
+set -e
+
+# Optional: matrix generator (see GENERATOR_NAMES in graph_generators.py) and its comma separated parameters
+generator=${1:-uniform}
+params=${2:-}
+# Optional: 1 permutes the rows and columns of A to balance the non-zeros of the PEs
+balance=${3:-0}
+balance_flag=""
+if [ "$balance" == "1" ]; then
+  balance_flag="-balance"
+fi
+# Optional: extent ratio > 0 replaces the uniform tile boundaries by nnz-equalizing cut points
+equalize=${4:-0}
+equalize_flag=""
+if [ "$equalize" != "0" ]; then
+  equalize_flag="-equalize=$equalize"
+fi
+# Optional: 16 packs two indices of A into every word on the device
+index_bits=${5:-32}
+# Optional: 16 stores the values of A and B in fp16 on the device
+value_bits=${6:-32}
+
+# The planner sizes the 16-bit index and fp16 variants separately, they fit larger tiles into the PE memory
+suffix=""
+if [ "$index_bits" == "16" ]; then
+  suffix="${suffix}_u16"
+fi
+if [ "$value_bits" == "16" ]; then
+  suffix="${suffix}_f16"
+fi
+params_file=../memory_limits/BSR${suffix}_params.txt
+if [ ! -f $params_file ]; then
+  params_file=../memory_limits/BSR_params.txt
+fi
+source $params_file
+
+testlen=${#A_heights[@]}
+
+for (( i=0; i<${testlen}; i++ ));
+do
+  vector_path="BSR_${A_heights[i]}x${A_widths[i]}_${A_densities[i]}"
+  if [ "$generator" != "uniform" ]; then
+    vector_path="BSR_${generator}_${A_heights[i]}x${A_widths[i]}_${A_densities[i]}"
+  fi
+  if [ "$balance" == "1" ]; then
+    vector_path="${vector_path}_balanced"
+  fi
+  if [ "$equalize" != "0" ]; then
+    vector_path="${vector_path}_equalized${equalize}"
+  fi
+  # Fetch the test vectors from the cache, the generation is skipped for configurations that are already cached
+  if [ "$generator" == "uniform" ]; then
+    python3 ../sparse_format_convertors/vector_cache.py ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} 6 0 $vector_path -generator=$generator -params=$params $balance_flag $equalize_flag > /dev/null
+    ./run_benchmark.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $vector_path $index_bits $value_bits
+  else
+    # Skewed and structured matrices may not exist for every shape or fit into the PE memory that was planned for uniform matrices
+    (python3 ../sparse_format_convertors/vector_cache.py ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} 6 0 $vector_path -generator=$generator -params=$params $balance_flag $equalize_flag > /dev/null && ./run_benchmark.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $vector_path $index_bits $value_bits) || echo "[!] $vector_path failed, skipping it"
+  fi
+done
\ No newline at end of file
@@ -10,6 +10,12 @@ grid_width=$5
 M_width=$6
 test_vectors=$7
 file_dir="$test_vectors/"
+# Optional: width of the index entries of A on the device (16 or 32)
+index_bits=${8:-32}
+# Optional: width of the values of A and B on the device (16 or 32)
+value_bits=${9:-32}
+# Optional: 1 drops the values of A, every entry is one (pattern-only test vectors)
+pattern_only=${10:-0}
 
 cd $test_vectors
 
@@ -18,10 +24,16 @@ val_len=${OUTPUT[0]}
 row_idx_len=${OUTPUT[1]}
 col_ptr_len=${OUTPUT[2]}
 
+# The tile extents follow the lengths, non-uniform tile boundaries pad every PE to the largest tile
+Nt=${OUTPUT[3]:-$(($A_height / $grid_height))}
+Kt=${OUTPUT[4]:-$(($A_width / $grid_width))}
+# Symmetric tile stores append 0 (no delta fields) and 1, only the PEs on and above the diagonal hold a tile
+symmetric=${OUTPUT[6]:-0}
+
 cd ..
 
-cslc ./layout.csl --fabric-dims=757,996 --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$(($A_height / $grid_height)),Kt:$(($A_width / $grid_width)),M:$M_width,A_val_len:$val_len,A_rowidx_len:$row_idx_len,A_colptr_len:$col_ptr_len,LAUNCH_ID:4 -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
+cslc ./layout.csl --fabric-dims=757,996 --fabric-offsets=4,1 --params=width:$grid_width,height:$grid_height,Nt:$Nt,Kt:$Kt,M:$M_width,A_val_len:$val_len,A_rowidx_len:$row_idx_len,A_colptr_len:$col_ptr_len,LAUNCH_ID:4,index_bits:$index_bits,value_bits:$value_bits,pattern_only:$pattern_only,symmetric:$symmetric -o=out --memcpy --channels=1 --width-west-buf=0 --width-east-buf=0
 
 echo "Running simulator now!"
 
-cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -file_dir=$file_dir -width=$grid_width -height=$grid_height -density=$A_density
\ No newline at end of file
+cs_python run_memcpy.py --name out -N=$A_height -K=$A_width -M=$M_width -A_prefix="tmp" -file_dir=$file_dir -width=$grid_width -height=$grid_height -density=$A_density -index_bits=$index_bits -value_bits=$value_bits
\ No newline at end of file
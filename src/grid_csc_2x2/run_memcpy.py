@@ -38,6 +38,7 @@ from typing import Optional
 import shutil
 import subprocess
 import numpy as np
+import sys
 
 from cerebras.sdk.runtime import runtime_utils # pylint: disable=no-name-in-module
 from cerebras.sdk.runtime.sdkruntimepybind import SdkRuntime # pylint: disable=no-name-in-module
@@ -51,6 +52,10 @@ BENCHMARKS_DIR = os.path.dirname(RESIDUAL_DIR)
 CSL_DIR = os.path.dirname(BENCHMARKS_DIR)
 CSLC = os.path.join(CSL_DIR, "build") + "/bin/cslc"
 
+# The tile store reader lives next to the sparse format convertors
+sys.path.append(os.path.join(BENCHMARKS_DIR, "sparse_format_convertors"))
+import tile_store # pylint: disable=wrong-import-position
+
 
 def cast_uint32(x):
   if isinstance(x, (np.float16, np.int16, np.uint16)):
@@ -215,18 +220,12 @@ def main():
   # prepare host data and reference solution
   file_dir = "test_vectors/"
 
-  # Use this for reference solution
-  A_dense_format = file_dir+A_prefix+".csv"
-  A_dense = np.genfromtxt(A_dense_format, delimiter=",", dtype=np.float32)
-
-  A_val_file = file_dir+A_prefix+"_val_pad.csv"
-  A_colptr_file = file_dir+A_prefix+"_col_ptr_pad.csv"
-  A_rowidx_file = file_dir+A_prefix+"_row_idx_pad.csv"
-
-  # Read in
-  A_val = np.genfromtxt(A_val_file, delimiter=",", dtype=np.float32)
-  A_row_idx = np.genfromtxt(A_rowidx_file, delimiter=",", dtype=np.float32)
-  A_col_ptr = np.genfromtxt(A_colptr_file, delimiter=",", dtype=np.float32)
+  # Read in A from the binary tile store (legacy vectors fall back to the padded CSV files)
+  # The kernel of this example reads the indices as f32 values
+  A_header, A_arrays = tile_store.load_grid(file_dir+A_prefix, ["val", "row_idx", "col_ptr"])
+  A_val = A_arrays["val"]
+  A_row_idx = A_arrays["row_idx"].astype(np.float32)
+  A_col_ptr = A_arrays["col_ptr"].astype(np.float32)
 
   # Get lengths
   A_val_len = A_val.shape[1]
@@ -237,7 +236,7 @@ def main():
   B = np.arange(K*M).reshape(K, M).astype(np.float32) + 100
 
   # TODO: implement CSC matmul
-  C_ref = np.matmul(A_dense, B)
+  C_ref = tile_store.reference_solution(file_dir+A_prefix, A_header, A_arrays, B)
   # TODO: print C_reference
   print(f"C_ref = {C_ref}")
 
@@ -368,7 +367,8 @@ def main():
                      streaming=False, data_type=memcpy_dtype, nonblock=False,
                      order=memcpy_order)
 
-  (px, py, w, h, l, data) = runtime_utils.convert_input_tensor(iportmap_B, B)
+  # The rows of B are permuted like the columns of a balanced A
+  (px, py, w, h, l, data) = runtime_utils.convert_input_tensor(iportmap_B, tile_store.device_B(A_header, A_arrays, B))
   simulator.memcpy_h2d(symbol_B, data, px, py, w, h, l,
                      streaming=False, data_type=memcpy_dtype, nonblock=False,
                      order=memcpy_order)
@@ -387,6 +387,9 @@ def main():
   # Reshape back to original state
   C_cs = np.reshape(C_cs, (N, M))
 
+  # Undo the row permutation of a balanced A
+  C_cs = tile_store.host_C(A_header, A_arrays, C_cs)
+
 
   simulator.stop()
 
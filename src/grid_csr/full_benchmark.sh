@@ -3,12 +3,84 @@
 set -x
 set -e
 
-source ../memory_limits/CSR_params.txt
+# Optional: matrix generator (see GENERATOR_NAMES in graph_generators.py) and its comma separated parameters
+generator=${1:-uniform}
+params=${2:-}
+# Optional: 1 permutes the rows and columns of A to balance the non-zeros of the PEs
+balance=${3:-0}
+balance_flag=""
+if [ "$balance" == "1" ]; then
+  balance_flag="-balance"
+fi
+# Optional: extent ratio > 0 replaces the uniform tile boundaries by nnz-equalizing cut points
+equalize=${4:-0}
+equalize_flag=""
+if [ "$equalize" != "0" ]; then
+  equalize_flag="-equalize=$equalize"
+fi
+# Optional: 16 packs two indices of A into every word on the device
+index_bits=${5:-32}
+# Optional: 16 stores the values of A and B in fp16 on the device
+value_bits=${6:-32}
+# Optional: 1 drops the values of A, every entry is one (unweighted adjacency matrices)
+pattern_only=${7:-0}
+pattern_flag=""
+if [ "$pattern_only" == "1" ]; then
+  pattern_flag="-pattern_only"
+fi
+# Optional: 1 stores the column indices of A as bit-packed deltas
+delta_indices=${8:-0}
+delta_flag=""
+if [ "$delta_indices" == "1" ]; then
+  delta_flag="-delta_indices"
+fi
+
+# The planner sizes the pattern-only, delta-encoded, 16-bit index and fp16 variants separately, they fit larger tiles into the PE memory
+suffix=""
+if [ "$pattern_only" == "1" ]; then
+  suffix="${suffix}_pattern"
+fi
+if [ "$delta_indices" == "1" ]; then
+  suffix="${suffix}_delta"
+fi
+if [ "$index_bits" == "16" ]; then
+  suffix="${suffix}_u16"
+fi
+if [ "$value_bits" == "16" ]; then
+  suffix="${suffix}_f16"
+fi
+params_file=../memory_limits/CSR${suffix}_params.txt
+if [ ! -f $params_file ]; then
+  params_file=../memory_limits/CSR_params.txt
+fi
+source $params_file
 
 testlen=${#A_heights[@]}
 
 for (( i=0; i<${testlen}; i++ ));
 do
   vector_path="CSR_${A_heights[i]}x${A_widths[i]}_${A_densities[i]}"
-  ./run_benchmark.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $vector_path
+  if [ "$generator" != "uniform" ]; then
+    vector_path="CSR_${generator}_${A_heights[i]}x${A_widths[i]}_${A_densities[i]}"
+  fi
+  if [ "$balance" == "1" ]; then
+    vector_path="${vector_path}_balanced"
+  fi
+  if [ "$equalize" != "0" ]; then
+    vector_path="${vector_path}_equalized${equalize}"
+  fi
+  if [ "$pattern_only" == "1" ]; then
+    vector_path="${vector_path}_pattern"
+  fi
+  if [ "$delta_indices" == "1" ]; then
+    vector_path="${vector_path}_delta"
+  fi
+  # Fetch the test vectors from the cache, the generation is skipped for configurations that are already cached
+  if [ "$generator" == "uniform" ]; then
+    python3 ../sparse_format_convertors/vector_cache.py ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} 1 0 $vector_path -generator=$generator -params=$params $balance_flag $equalize_flag $pattern_flag $delta_flag > /dev/null
+    ./run_benchmark.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $vector_path $index_bits $value_bits $pattern_only
+  else
+    # Skewed and structured matrices may not exist for every shape or fit into the PE memory that was planned for uniform matrices
+    (python3 ../sparse_format_convertors/vector_cache.py ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} 1 0 $vector_path -generator=$generator -params=$params $balance_flag $equalize_flag $pattern_flag $delta_flag > /dev/null && ./run_benchmark.sh ${A_heights[i]} ${A_widths[i]} ${A_densities[i]} ${grid_h[i]} ${grid_w[i]} ${M_w[i]} $vector_path $index_bits $value_bits $pattern_only) || echo "[!] $vector_path failed, skipping it"
+  fi
 done
\ No newline at end of file
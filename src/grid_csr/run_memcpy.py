@@ -44,6 +44,7 @@ import subprocess
 import numpy as np
 import math
 import csv
+import sys
 
 from cerebras.sdk.runtime import runtime_utils # pylint: disable=no-name-in-module
 from cerebras.sdk.runtime.sdkruntimepybind import SdkRuntime # pylint: disable=no-name-in-module
@@ -57,6 +58,10 @@ BENCHMARKS_DIR = os.path.dirname(RESIDUAL_DIR)
 CSL_DIR = os.path.dirname(BENCHMARKS_DIR)
 CSLC = os.path.join(CSL_DIR, "build") + "/bin/cslc"
 
+# The tile store reader lives next to the sparse format convertors
+sys.path.append(os.path.join(BENCHMARKS_DIR, "sparse_format_convertors"))
+import tile_store # pylint: disable=wrong-import-position
+
 
 def cast_uint32(x):
   if isinstance(x, (np.float16, np.int16, np.uint16)):
@@ -98,6 +103,10 @@ def parse_args():
                       help="height of PEs")
   parser.add_argument("-density", type=int,
                       help="density of A in percent")
+  parser.add_argument("-index_bits", type=int, default=32, choices=[16, 32],
+                      help="width of the index entries of A on the device, 16-bit indices are packed two per word")
+  parser.add_argument("-value_bits", type=int, default=32, choices=[16, 32],
+                      help="width of the values of A and B on the device, C is always accumulated in fp32")
   parser.add_argument(
       "--cslc",
       required=False,
@@ -154,6 +163,11 @@ def csl_compile(
     compile_flag: bool,
     arch: Optional[str],
     LAUNCH: int,
+    index_bits: int,
+    value_bits: int,
+    symmetric: bool,
+    pattern_only: bool,
+    delta_bits: int,
     A_val_len: int,
     A_colidx_len: int,
     A_rowptr_len: int,
@@ -178,6 +192,11 @@ def csl_compile(
     args.append(f"--params=Nt:{Nt}, Kt:{Kt}, M:{M}, A_val_len:{A_val_len}, A_colidx_len:{A_colidx_len}, A_rowptr_len:{A_rowptr_len}") # options
 
     args.append(f"--params=LAUNCH_ID:{LAUNCH}") # options
+    args.append(f"--params=index_bits:{index_bits}") # options
+    args.append(f"--params=value_bits:{value_bits}") # options
+    args.append(f"--params=symmetric:{int(symmetric)}") # options
+    args.append(f"--params=pattern_only:{int(pattern_only)}") # options
+    args.append(f"--params=delta_bits:{delta_bits}") # options
 
     args.append(f"-o={comp_dir}")
     if arch is not None:
@@ -239,14 +258,8 @@ def main():
   else:
     density = 100
 
-  Nt = N // height
-  Kt= K // width
-
-  assert N == (Nt*height), "N must be multiple of Nt"
-  assert K == (Kt*width), "K must be multiple of Kt"
-
-  Nt = int(Nt)
-  Kt = int(Kt)
+  index_bits = args.index_bits
+  value_bits = args.value_bits
 
   print(f"N = {N}, K = {K}, M = {M}, width = {width}, height = {height}")
 
@@ -255,39 +268,60 @@ def main():
   multiple = int(align/4)
   padded_M = math.ceil((M+1)/multiple)*multiple
 
-  # Use this for reference solution
-  A_dense_format = file_dir+A_prefix+".csv"
-  A_dense = np.genfromtxt(A_dense_format, delimiter=",", dtype=np.float32)
+  # Read in A from the binary tile store (legacy vectors fall back to the padded CSV files)
+  A_header, A_arrays = tile_store.load_grid(file_dir+A_prefix, ["val", "col_idx", "row_ptr"])
+  # Symmetric tile stores only hold the tiles on and above the diagonal, the PEs apply them a second time transposed
+  symmetric = A_header is not None and A_header.get("triangle", False)
+  # Pattern-only matrices carry no values, every stored entry of A is one
+  pattern_only = A_header is not None and A_header.get("pattern_only", False)
+  A_val = None if pattern_only else tile_store.pack_values(A_arrays["val"], value_bits)
+  # Delta-encoded column indices are bit-packed fields of delta_bits bits (see tile_store.delta_encode)
+  delta_bits = A_header.get("delta_bits", 0) if A_header is not None else 0
+  if delta_bits:
+    A_col_idx = tile_store.pack_fields(A_arrays["col_idx"], delta_bits)
+  else:
+    A_col_idx = tile_store.pack_indices(A_arrays["col_idx"], index_bits)
+  A_row_ptr = tile_store.pack_indices(A_arrays["row_ptr"], index_bits)
 
-  A_val_file = file_dir+A_prefix+"_val_pad.csv"
-  A_rowptr_file = file_dir+A_prefix+"_row_ptr_pad.csv"
-  A_colidx_file = file_dir+A_prefix+"_col_idx_pad.csv"
+  # Non-uniform cut points pad every PE to the largest tile, the device computes on the expanded N_dev x K_dev matrix
+  N_dev, K_dev = tile_store.device_dims(A_header, N, K)
+  Nt = N_dev // height
+  Kt = K_dev // width
 
-  # Read in
-  A_val = np.genfromtxt(A_val_file, delimiter=",", dtype=np.float32)
-  A_col_idx = np.genfromtxt(A_colidx_file, delimiter=",", dtype=np.int32)
-  A_row_ptr = np.genfromtxt(A_rowptr_file, delimiter=",", dtype=np.int32)
+  assert N_dev == (Nt*height), "N must be multiple of Nt"
+  assert K_dev == (Kt*width), "K must be multiple of Kt"
+
+  Nt = int(Nt)
+  Kt = int(Kt)
 
   # Get lengths
-  A_val_len = A_val.shape[1]
-  A_colidx_len = A_col_idx.shape[1]
-  A_rowptr_len = A_row_ptr.shape[1]
+  A_val_len = A_header["lengths"]["val"] if pattern_only else A_arrays["val"].shape[1]
+  A_colidx_len = A_arrays["col_idx"].shape[1]
+  A_rowptr_len = A_arrays["row_ptr"].shape[1]
 
   np.random.seed(2)
   B = np.arange(K*M).reshape(K, M).astype(np.float32) + 100
+  if value_bits == 16:
+    # The entries above would exceed the fp16 range
+    B = np.random.rand(K, M).astype(np.float32)
 
-  C_ref = np.matmul(A_dense, B)
+  # Use this for reference solution
+  C_ref = tile_store.reference_solution(file_dir+A_prefix, A_header, A_arrays, B)
   print(f"C_ref = {C_ref}")
 
   print(f"B = {B}")
 
   # Set up the actual B data:
   # Now insert additional columns to make it divisible by the alignment
+  # The rows of B are laid out like the columns of A on the device
   num_zero_columns = padded_M - M 
-  padded_B = np.pad(B, [(0, 0), (0, num_zero_columns)], mode='constant')
+  padded_B = np.pad(tile_store.device_B(A_header, A_arrays, B), [(0, 0), (0, num_zero_columns)], mode='constant')
 
   print(f"padded B = {padded_B}")
 
+  # fp16 rows of B are packed two values per word like the values of A
+  padded_B = tile_store.pack_values(padded_B, value_bits)
+
   # prepare the simulation
 
   # core dump after execution is complete
@@ -338,6 +372,11 @@ def main():
       args.compile,
       args.arch,
       LAUNCH,
+      index_bits,
+      value_bits,
+      symmetric,
+      pattern_only,
+      delta_bits,
       A_val_len,
       A_colidx_len,
       A_rowptr_len,
@@ -373,21 +412,9 @@ def main():
   simulator.load()
   simulator.run()
 
-  num_PE = width*height
-
-  # iport maps for A arrays are derived from Leighton's advice
-  iportmap_A_val = f"{{ A_val[i=0:{num_PE-1}][j=0:{A_val_len-1}] -> [PE[i % {width}, i // {width}] -> index[j]] }}"
-  print(f"iportmap_A_val = {iportmap_A_val}")
-
-  iportmap_A_col_idx = f"{{ A_col_idx[i=0:{num_PE-1}][j=0:{A_colidx_len-1}] -> [PE[i % {width}, i // {width}] -> index[j]] }}"
-  print(f"iportmap_A_col_idx = {iportmap_A_col_idx}")
-
-  iportmap_A_row_ptr = f"{{ A_row_ptr[i=0:{num_PE-1}][j=0:{A_rowptr_len-1}] -> [PE[i % {width}, i // {width}] -> index[j]] }}"
-  print(f"iportmap_A_row_ptr = {iportmap_A_row_ptr}")
-
   # B distributes to {py = 0}
   # derived from Residual example code
-  iportmap_B = f"{{ padded_B[i=0:{K-1}][j=0:{padded_M-1}] -> [PE[i//{Kt}, 0] ->  index[i%{Kt}, j]] }}"
+  iportmap_B = f"{{ padded_B[i=0:{K_dev-1}][j=0:{padded_B.shape[1]-1}] -> [PE[i//{Kt}, 0] ->  index[i%{Kt}, j]] }}"
   print(f"iportmap_B = {iportmap_B}")
 
   # C is gathered from P1.0 and P1.1
@@ -395,24 +422,26 @@ def main():
   # C's size in each PE is Nt*M
   # (Remember: Nt = N // height)
   # Total size: height * Nt * M = N * M 
-  oportmap_C = f"{{ C[n = 0:{N*padded_M-1}] -> [PE[{width-1}, n // {Nt*padded_M}] -> index[n % {Nt*padded_M}]] }}"
+  oportmap_C = f"{{ C[n = 0:{N_dev*padded_M-1}] -> [PE[{width-1}, n // {Nt*padded_M}] -> index[n % {Nt*padded_M}]] }}"
 
   # prepare all of A and B via memcpy
   # use the runtime_utils library to calculate memcpy args and shuffle data
-  (px, py, w, h, l, data) = runtime_utils.convert_input_tensor(iportmap_A_val, A_val)
-  simulator.memcpy_h2d(symbol_A_val, data, px, py, w, h, l,
-                     streaming=False, data_type=memcpy_dtype, nonblock=False,
-                     order=memcpy_order)
-
-  (px, py, w, h, l, data) = runtime_utils.convert_input_tensor(iportmap_A_col_idx, A_col_idx)
-  simulator.memcpy_h2d(symbol_A_col_idx, data, px, py, w, h, l,
-                     streaming=False, data_type=memcpy_dtype, nonblock=False,
-                     order=memcpy_order)
-
-  (px, py, w, h, l, data) = runtime_utils.convert_input_tensor(iportmap_A_row_ptr, A_row_ptr)
-  simulator.memcpy_h2d(symbol_A_row_ptr, data, px, py, w, h, l,
-                     streaming=False, data_type=memcpy_dtype, nonblock=False,
-                     order=memcpy_order)
+  # the lines of the A arrays go to the PEs that hold their tiles (see tile_store.device_copies)
+  if not pattern_only:
+    for (px, py, w, h, l, data) in tile_store.device_copies(A_header, A_val, width, height):
+      simulator.memcpy_h2d(symbol_A_val, data, px, py, w, h, l,
+                         streaming=False, data_type=memcpy_dtype, nonblock=False,
+                         order=memcpy_order)
+
+  for (px, py, w, h, l, data) in tile_store.device_copies(A_header, A_col_idx, width, height):
+    simulator.memcpy_h2d(symbol_A_col_idx, data, px, py, w, h, l,
+                       streaming=False, data_type=memcpy_dtype, nonblock=False,
+                       order=memcpy_order)
+
+  for (px, py, w, h, l, data) in tile_store.device_copies(A_header, A_row_ptr, width, height):
+    simulator.memcpy_h2d(symbol_A_row_ptr, data, px, py, w, h, l,
+                       streaming=False, data_type=memcpy_dtype, nonblock=False,
+                       order=memcpy_order)
 
   (px, py, w, h, l, data) = runtime_utils.convert_input_tensor(iportmap_B, padded_B)
   simulator.memcpy_h2d(symbol_B, data, px, py, w, h, l,
@@ -431,9 +460,12 @@ def main():
   C_cs = runtime_utils.format_output_tensor(oportmap_C, np.float32, data)
 
   # Reshape back to original state
-  C_cs = np.reshape(C_cs, (N, padded_M))
+  C_cs = np.reshape(C_cs, (N_dev, padded_M))
   C_cs = C_cs[:, 1:-(padded_M-1-M)] if padded_M-1!=M else C_cs[:, 1:]
 
+  # Drop the padding rows of non-uniform cut points and undo the row permutation of a balanced A
+  C_cs = tile_store.host_C(A_header, A_arrays, C_cs)
+
   # Copy back timestamps
   data = np.zeros((width*height*3, 1), dtype=np.float32)
   simulator.memcpy_d2h(data, symbol_time_memcpy, 0, 0, width, height, 3,
@@ -475,13 +507,17 @@ def main():
   # Calculate bandwidth
   #####################
 
-  # Iterate over A_val_len: Read five elements and read two rows B,C
+  # Iterate over A_val_len: Read five elements (four without the values of a pattern-only A) and read two rows B,C
   # = 4*A_val_len*(5 + 2*padded_M)
   # For absolute accesses also include writes to C = 4*A_val_len*(5 + 3*padded_M)
+  entry_reads = 4 if pattern_only else 5
+
+  # Symmetric tile stores pass twice over the tiles on and above the diagonal, the PEs below it hold no tile
+  tile_passes = height*(height+1) if symmetric else width*height
 
-  total_relative_accesses = width * height * (4*A_val_len*(5 + 2*padded_M))
-  total_absolute_accesses = width * height * (4*A_val_len*(5 + 3*padded_M))
-  total_flop = width * height * (A_val_len*padded_M*2)
+  total_relative_accesses = tile_passes * (4*A_val_len*(entry_reads + 2*padded_M))
+  total_absolute_accesses = tile_passes * (4*A_val_len*(entry_reads + 3*padded_M))
+  total_flop = tile_passes * (A_val_len*padded_M*2)
 
   #################
   # Generate output
@@ -498,12 +534,17 @@ def main():
   print("FP operations:             ", total_flop)
   print()
 
+  # Deviation from the fp32 reference, fp16 runs report it as last column of their CSV
+  max_rel_error = tile_store.relative_error(C_ref, C_cs)
+  print("Max relative error:        ", max_rel_error)
+  print()
+
   # Write a CSV
-  csv_name = f"CSR_benchmark" + ".csv"
+  csv_name = tile_store.benchmark_filename("CSR", A_header, index_bits, value_bits)
   with open(csv_name, mode='a') as csv_file:
     csv_writer = csv.writer(csv_file)
     csv_writer.writerow([width, height, N, K, padded_M, density, avg_cycles, min_cycles, max_cycles,
-      total_relative_accesses, total_absolute_accesses,  total_flop])
+      total_relative_accesses, total_absolute_accesses,  total_flop] + ([max_rel_error] if value_bits != 32 else []))
 
   if args.cmaddr is None:
     #move simulation log and core dump to the given folder
@@ -517,7 +558,11 @@ def main():
   print(f"`C_ref`     from CPU:\n{C_ref}")
   print(f"`C_cs`  from CS1 (1-by-1 matrix):\n{C_cs}")
 
-  assert np.allclose(C_ref, C_cs, 1.e-5)
+  # fp16 inputs are rounded, so entries of C near zero are judged by the max relative error (against the largest entry)
+  if value_bits == 16:
+    assert max_rel_error <= tile_store.VALUE_RTOL[value_bits]
+  else:
+    assert np.allclose(C_ref, C_cs, tile_store.VALUE_RTOL[value_bits])
 
   
   print("\nSUCCESS!")
@@ -1,5 +1,6 @@
 # This file calculates the memory limits for each of the sparse grid formats
 
+import argparse
 import numpy as np
 import math
 import matplotlib.pyplot as plt
@@ -8,19 +9,515 @@ import datetime,os
 import itertools
 from matplotlib.font_manager import FontProperties
 from scipy.stats import norm
+import functools
 import subprocess
+import sys
 from tqdm import tqdm
 
 from operator import itemgetter
 
+# The matrix generators live next to the sparse format convertors
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sparse_format_convertors"))
+import edge_list # pylint: disable=wrong-import-position
+import graph_generators # pylint: disable=wrong-import-position
+import grid_generator # pylint: disable=wrong-import-position
+import partitioner # pylint: disable=wrong-import-position
+import tile_store # pylint: disable=wrong-import-position
+
 # Defines the memory available per PE
 MEM = 48*1024
 RESERVED = 6*1024 # Reserve 6 kB of memory for program, dsd buffers etc.
 GUARANTEE = 0.99
 AVAIL_HEIGHT = 996
 AVAIL_WIDTH = 757
+# Largest block extents of the nnz-equalizing tile boundaries (relative to the uniform extent) that are tried
+EXTENT_RATIOS = (1.0, 1.25, 1.5, 2.0, 3.0)
+# [IMPORTANT]: Change the width of the index entries of A here (32 or 16, the drivers pack 16-bit indices two per word)
+INDEX_BITS = 32
+
+# [IMPORTANT]: Change the width of the values of A and B here (32 or 16, C is always accumulated in fp32)
+VALUE_BITS = 32
+
+# [IMPORTANT]: Set to True to plan pattern-only matrices, CSC, CSR, COO and ELLPACK then drop the values of A
+PATTERN_ONLY = False
+
+# Formats that support pattern-only matrices and the ones among them whose padding points to an extra zero row of B
+PATTERN_FORMATS = (0, 1, 2, 3)
+PADDING_ROW_FORMATS = (2, 3)
+
+# [IMPORTANT]: Set to True to plan symmetric matrices (the mirrored upper triangle of the generated matrix, N == K only)
+# Only square grids are planned, the PEs on and above the diagonal hold the stored tiles of the upper triangle and
+# additionally B_T and C_T of the transposed pass (transposed_words), the nnz-equalizing boundaries are not supported
+SYMMETRIC = False
+
+# [IMPORTANT]: Set to True to plan bit-packed delta column indices, CSR and ELLPACK then store their columns as deltas
+DELTA_INDICES = False
+
+# [IMPORTANT]: Set to True to compute the padded lengths of uniform matrices from the generated matrix instead of
+# bounding them with the analytical model (uniform_lengths), e.g. to verify configurations planned to the last byte
+# The matrix is generated once and the statistics of every grid are re-binned from it (grid_stats)
+EXACT_LENGTHS = False
+
+# [IMPORTANT]: Set to True to take the padded lengths of uniform matrices from ./a.out (check_memory.c), the matrix the
+# baseline configurations (FORMAT_params.txt) were planned and benchmarked with, verify_limits.py checks them this way
+CONVERTOR_LENGTHS = False
+
+# [IMPORTANT]: Set to True to compare the analytical model of uniform matrices against the exact generator instead of planning
+VALIDATE_MODEL = False
+
+def index_words(length):
+    """Returns the number of 32-bit words of an index array with length entries of INDEX_BITS bits"""
+    return tile_store.index_words(length, INDEX_BITS)
+
+def value_words(length):
+    """Returns the number of 32-bit words of a value array (of A or B) with length entries of VALUE_BITS bits"""
+    return tile_store.index_words(length, VALUE_BITS)
+
+def a_value_words(length):
+    """Returns the number of 32-bit words of the values of A, pattern-only matrices keep a one-word placeholder"""
+    return 1 if PATTERN_ONLY else value_words(length)
+
+def b_rows(Kt, fmt_type):
+    """Returns the number of rows of B on a PE, the padding of pattern-only COO and ELLPACK reads an extra zero row"""
+    return Kt+1 if PATTERN_ONLY and fmt_type in PADDING_ROW_FORMATS else Kt
+
+def transposed_words(Nt, Kt, padded_M):
+    """Returns the number of 32-bit words of B_T and C_T of the transposed pass of symmetric matrices, zero otherwise"""
+    return value_words(Kt*padded_M) + Nt*padded_M if SYMMETRIC else 0
+
+def bitmap_words(Nt, Kt):
+    """Returns the number of 32-bit words of the bitmap of a Nt x Kt tile, every row starts at a new word"""
+    return Nt*math.ceil(Kt/grid_generator.BITMAP_BITS)
+
+def nm_slots(Nt, Kt, n):
+    """Returns the number of slots of a Nt x Kt tile with n slots per group of NM_M columns"""
+    return Nt*math.ceil(Kt/grid_generator.NM_M)*n
+
+@functools.lru_cache(maxsize=4)
+def generate_matrix(generator, N, K, density, symmetric=False):
+    """Generates (and caches) a matrix of one of the graph generators, it is reused for every grid size
+
+    Symmetric matrices keep the upper triangle of the generated matrix like grid_generator.stream_stripes, its tiles
+    below the diagonal stay empty, so the padded lengths are the ones of the stored tiles.
+    """
+    rows, cols, vals = graph_generators.generate_matrix(generator, N, K, density)
+    if symmetric:
+        upper = cols >= rows
+        rows, cols, vals = rows[upper], cols[upper], vals[upper]
+    return rows, cols, vals
+
+def get_grid_lengths(N, K, height, width, density, fmt_type, generator):
+    """Gets the padded lengths of a matrix of one of the graph generators in-process
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    fmt_type: 0: CSC, 1: CSR, 2: COO, 3: ELLPACK, 4: HYB, 5: SELL, 6: BSR, 7: DCSR, 8: DCSC, 9: BITMAP, 10: NM
+    generator: "uniform", "rmat", "kronecker" or "chung-lu"
+
+    Returns
+    -------
+    Padded lengths of the grid arrays in the order of the format (e.g. val, col_idx, row_ptr for CSR)
+    """
+    rows, cols, vals = generate_matrix(generator, N, K, density, SYMMETRIC)
+    grid = grid_generator.convert_to_grid(rows, cols, vals, N, K, height, width, fmt_type)
+
+    return [int(array.shape[1]) for array in grid.values()]
+
+def get_delta_words(N, K, height, width, density, fmt_type, generator="uniform"):
+    """Gets the 32-bit words per PE of the delta-encoded column indices of CSR or ELLPACK in-process
+
+    The delta fields depend on the gaps between the columns, so the matrix is always generated and encoded
+    like tile_store.save_store (the width of the fields is chosen per grid). The gaps of a real graph are unknown,
+    its fields are bounded by 16-bit fields that never escape.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    fmt_type: 1: CSR, 3: ELLPACK
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker", "chung-lu" or a structured generator)
+                          or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    Number of words of the delta fields of every PE
+    """
+    fmt = grid_generator.FORMAT_NAMES[fmt_type]
+    Nt, Kt = N // height, K // width
+    # CSR and ELLPACK tiles hold one line of column indices and Nt lines
+    lines_per_tile = Nt if fmt_type == 3 else 1
+    if(generator.endswith(".npz")):
+        return tile_store.field_words(lines_per_tile*get_degree_lengths(generator, height, width, fmt_type)[1], 16)
+
+    rows, cols, vals = generate_matrix(generator, N, K, density, SYMMETRIC)
+    grid = grid_generator.convert_to_grid(rows, cols, vals, N, K, height, width, fmt_type)
+    if PATTERN_ONLY:
+        grid = tile_store.drop_values(fmt, grid, Kt)
+    grid, bits = tile_store.delta_encode(fmt, grid, Nt, Kt)
+
+    return tile_store.field_words(lines_per_tile*int(grid[tile_store.DELTA_ARRAYS[fmt]].shape[1]), bits)
+
+@functools.lru_cache(maxsize=None)
+def max_block_nnz(total, nnz, draws, count, guarantee=GUARANTEE):
+    """Bounds the largest number of non-zeros among count disjoint blocks of a uniform matrix
+
+    A uniform matrix places nnz non-zeros on distinct positions out of total, so the non-zeros of a block of draws
+    positions are hypergeometric. They are bounded by the binomial distribution, which draws with replacement and has
+    the larger tail. The largest of count blocks stays below the bound with probability guarantee if every block
+    stays below the quantile guarantee**(1/count) of its own distribution.
+
+    Parameters
+    ----------
+    total: number of positions of the matrix
+    nnz: number of non-zeros of the matrix
+    draws: number of positions of a block
+    count: number of blocks
+    guarantee (optional): probability that no block exceeds the bound
+
+    Returns
+    -------
+    Bound of the largest number of non-zeros of a block
+    """
+    if nnz == 0:
+        return 0
+    bound = stats.binom.ppf(guarantee**(1/count), draws, nnz/total)
+    return int(min(bound, draws, nnz))
+
+def uniform_stats(N, K, height, width, density):
+    """Bounds the largest tile, row and column of the tiles of a uniform matrix analytically
+
+    The matrix has the non-zeros of convertor.c (density percent of the positions, rounded down). There are
+    height*width tiles, N*width rows and K*height columns of a tile, every one of them is bounded by max_block_nnz.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+
+    Returns
+    -------
+    Largest number of non-zeros of a tile, of a row of a tile and of a column of a tile
+    """
+    Nt, Kt = math.ceil(N/height), math.ceil(K/width)
+    total = N*K
+    nnz = int(density*total/100.0)
+
+    return (max_block_nnz(total, nnz, Nt*Kt, height*width, GUARANTEE),
+            max_block_nnz(total, nnz, Kt, N*width, GUARANTEE),
+            max_block_nnz(total, nnz, Nt, K*height, GUARANTEE))
+
+@functools.lru_cache(maxsize=4)
+def uniform_matrix(N, K, density, seed=0):
+    """Generates (and caches) the coordinates of a uniform matrix, they are reused for every grid size"""
+    rows, cols, _ = grid_generator.generate_sparse_matrix(N, K, density, seed)
+    return rows, cols
+
+def block_stats(rows, cols, N, K, height, width):
+    """Returns the largest tile, row and column of the tiles of a height x width grid of a coordinate matrix"""
+    Nt, Kt = math.ceil(N/height), math.ceil(K/width)
+    return (int(np.bincount((rows // Nt)*width + cols // Kt).max(initial=0)),
+            int(np.bincount(rows*width + cols // Kt).max(initial=0)),
+            int(np.bincount(cols*height + rows // Nt).max(initial=0)))
+
+@functools.lru_cache(maxsize=4)
+def grid_stats(N, K, density, seed=0):
+    """Computes the exact statistics of every grid that divides a uniform matrix from one generated matrix
+
+    The row lengths only depend on the grid width and the column lengths on the grid height, so the matrix is binned
+    once per width into the entries of every row in every column block and once per height. The tiles of a grid
+    sum Nt of these rows, re-binning the N x width counts instead of the entries of the matrix.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    density: density of the matrix A
+    seed (optional): seed of the random number generator
+
+    Returns
+    -------
+    Dictionary of (height, width) to the largest tile, row and column of the tiles (see uniform_stats)
+    """
+    rows, cols = uniform_matrix(N, K, density, seed)
+    heights = [i for i in range(1, AVAIL_HEIGHT) if N % i == 0]
+    widths = [i for i in range(1, AVAIL_WIDTH) if K % i == 0]
+
+    col_nnz = {height: int(np.bincount(cols*height + rows // (N // height)).max(initial=0)) for height in heights}
+
+    grid_nnz = {}
+    for width in widths:
+        row_counts = np.bincount(rows*width + cols // (K // width), minlength=N*width).reshape(N, width)
+        row_nnz = int(row_counts.max(initial=0))
+        for height in heights:
+            tile_nnz = int(row_counts.reshape(height, N // height, width).sum(axis=1).max(initial=0))
+            grid_nnz[(height, width)] = (tile_nnz, row_nnz, col_nnz[height])
+
+    return grid_nnz
+
+def exact_stats(N, K, height, width, density, seed=0):
+    """Returns the largest tile, row and column of the tiles of a generated uniform matrix (see uniform_stats)
+
+    Grids that divide the matrix are looked up in grid_stats, the others are binned on their own.
+    """
+    grid_nnz = grid_stats(N, K, density, seed)
+    if (height, width) in grid_nnz:
+        return grid_nnz[(height, width)]
+
+    rows, cols = uniform_matrix(N, K, density, seed)
+    return block_stats(rows, cols, N, K, height, width)
+
+def convertor_lengths(N, K, height, width, density, fmt_type):
+    """Gets the padded lengths of the uniform matrix of ./a.out (check_memory.c) in CSC, CSR, COO or ELLPACK"""
+    retrieve_params = subprocess.check_output(f"./a.out {N} {K} {density} {height} {width} {fmt_type}", shell=True, universal_newlines=True)
+    return tuple(int(line) for line in retrieve_params.splitlines())
+
+def uniform_lengths(N, K, height, width, density, fmt_type):
+    """Gets the padded lengths of a uniform matrix in CSC, CSR, COO or ELLPACK from the analytical model or exactly
+    from the generated matrix (EXACT_LENGTHS), the baseline configurations are checked against ./a.out (CONVERTOR_LENGTHS)
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    fmt_type: 0: CSC, 1: CSR, 2: COO, 3: ELLPACK
+
+    Returns
+    -------
+    Padded lengths of the grid arrays in the order of the format (e.g. val, col_idx, row_ptr for CSR)
+    """
+    if CONVERTOR_LENGTHS:
+        return convertor_lengths(N, K, height, width, density, fmt_type)
+
+    Nt, Kt = math.ceil(N/height), math.ceil(K/width)
+    tile_stats = exact_stats if EXACT_LENGTHS else uniform_stats
+    tile_nnz, row_nnz, _ = tile_stats(N, K, height, width, density)
+
+    if(fmt_type == 0):
+        return tile_nnz, tile_nnz, Kt+1
+    elif(fmt_type == 1):
+        return tile_nnz, tile_nnz, Nt+1
+    elif(fmt_type == 2):
+        return (tile_nnz,)
+    elif(fmt_type == 3):
+        return (row_nnz,)
+    raise ValueError(f"The uniform lengths are not defined for the format {fmt_type}, expected one of 0, 1, 2, 3")
+
+def validate_model(N, K, density, seed=0):
+    """Compares the analytical model of uniform matrices against the exact generator for every grid of N x K
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    density: density of the matrix A
+    seed (optional): seed of the random number generator
+
+    Returns
+    -------
+    List of (height, width, model, exact) with the largest tile, row and column of the model and of the matrix
+    """
+    return [(height, width, uniform_stats(N, K, height, width, density), exact)
+            for (height, width), exact in grid_stats(N, K, density, seed).items()]
+
+@functools.lru_cache(maxsize=4)
+def load_degrees(filename):
+    """Loads (and caches) the node degrees written by edge_list.py, they are reused for every grid size"""
+    return edge_list.load_degrees(filename)
+
+def get_degree_lengths(filename, height, width, fmt_type):
+    """Bounds the padded lengths of a real graph from its node degrees
+
+    The non-zeros of a tile are bounded by the non-zeros of its row block, of its column block and by its size,
+    and an ELLPACK row by the degree of its node and the tile width. The bounds are exact for the pointer arrays.
+    The HYB widths depend on the rows of every tile, the ELLPACK width and the COO length are bounded separately.
+    SELL is bounded like ELLPACK, every slot of the slices holds at most the width of a row. BSR chooses the block
+    size with the least memory, so it is bounded by the memory of 1 x 1 blocks (the CSR lengths). DCSR (DCSC) only
+    stores the non-empty rows (columns) of a tile, they are bounded by the rows (columns) of its block with a degree.
+    The bitmap of BITMAP only depends on the tile extents. Every group of NM holds at most m entries and at most
+    the degree of its row.
+
+    Parameters
+    ----------
+    filename: node degrees of the graph (<prefix>_degrees.npz written by edge_list.py)
+    height: grid height
+    width: grid width
+    fmt_type: 0: CSC, 1: CSR, 2: COO, 3: ELLPACK, 4: HYB, 5: SELL, 6: BSR, 7: DCSR, 8: DCSC, 9: BITMAP, 10: NM
+
+    Returns
+    -------
+    Upper bounds of the padded lengths of the grid arrays in the order of the format
+    """
+    out_degree, in_degree = load_degrees(filename)
+    Nt = math.ceil(out_degree.size / height)
+    Kt = math.ceil(in_degree.size / width)
+
+    def block_sums(degree, block):
+        padded = np.zeros(math.ceil(degree.size / block)*block, dtype=np.int64)
+        padded[:degree.size] = degree
+        return padded.reshape(-1, block).sum(axis=1)
+
+    if(fmt_type == 3):
+        return [min(int(out_degree.max(initial=0)), Kt)]*2
+
+    nnz = min(int(block_sums(out_degree, Nt).max(initial=0)), int(block_sums(in_degree, Kt).max(initial=0)), Nt*Kt)
+    if(fmt_type == 0):
+        return [nnz, nnz, Kt+1]
+    if(fmt_type == 1 or fmt_type == 6):
+        return [nnz, nnz, Nt+1]
+    if(fmt_type == 4):
+        width = min(int(out_degree.max(initial=0)), Kt)
+        return [width, width, nnz, nnz, nnz, 2]
+    if(fmt_type == 5):
+        num_slices = math.ceil(Nt / grid_generator.SELL_C)
+        length = num_slices*grid_generator.SELL_C*min(int(out_degree.max(initial=0)), Kt)
+        return [length, length, num_slices, num_slices*grid_generator.SELL_C]
+    if(fmt_type == 7 or fmt_type == 8):
+        degree, block = (out_degree, Nt) if fmt_type == 7 else (in_degree, Kt)
+        nonempty = max(min(int(block_sums(degree > 0, block).max(initial=0)), nnz), 1)
+        return [nnz, nnz, nonempty, nonempty+1]
+    if(fmt_type == 9):
+        return [nnz, bitmap_words(Nt, Kt)]
+    if(fmt_type == 10):
+        return [nm_slots(Nt, Kt, min(int(out_degree.max(initial=0)), grid_generator.NM_M))]*2 + [2]
+    return [nnz, nnz, nnz]
+
+def get_lengths(N, K, height, width, density, fmt_type, generator):
+    """Gets the padded lengths of a non-uniform matrix, generator is a matrix generator or the node degrees of a graph"""
+    if(generator.endswith(".npz")):
+        return get_degree_lengths(generator, height, width, fmt_type)
+    return get_grid_lengths(N, K, height, width, density, fmt_type, generator)
+
+def get_equalized_lengths(N, K, height, width, density, fmt_type, generator, extent_ratio):
+    """Gets the padded lengths of a non-uniform matrix with nnz-equalizing tile boundaries
+
+    The cut points are computed like in grid_generator.stream_stripes, every PE is padded to the largest tile.
+    The lengths are exact for the matrix generators and upper bounds for the node degrees of a graph.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    fmt_type: 0: CSC, 1: CSR, 2: COO, 3: ELLPACK, 4: HYB, 5: SELL, 6: BSR, 7: DCSR, 8: DCSC, 9: BITMAP, 10: NM
+    generator: matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+    extent_ratio: largest block extent relative to the uniform extent
+
+    Returns
+    -------
+    Padded lengths of the grid arrays in the order of the format and the tile extents Nt, Kt
+    """
+    if SYMMETRIC:
+        raise ValueError("Symmetric matrices cannot be equalized, the row and column blocks have to match")
+
+    if(generator.endswith(".npz")):
+        row_nnz, col_nnz = load_degrees(generator)
+    else:
+        rows, cols, vals = generate_matrix(generator, N, K, density)
+        row_nnz = np.bincount(rows, minlength=N)
+        col_nnz = np.bincount(cols, minlength=K)
+
+    row_cuts = partitioner.equalized_cuts(row_nnz, height, math.floor(extent_ratio*math.ceil(row_nnz.size / height)))
+    col_cuts = partitioner.equalized_cuts(col_nnz, width, math.floor(extent_ratio*math.ceil(col_nnz.size / width)))
+    Nt, Kt = partitioner.cut_extent(row_cuts), partitioner.cut_extent(col_cuts)
+
+    if(generator.endswith(".npz")):
+        if(fmt_type == 3):
+            return [min(int(row_nnz.max(initial=0)), Kt)]*2, Nt, Kt
+        row_blocks = np.diff(np.concatenate(([0], np.cumsum(row_nnz)))[row_cuts])
+        col_blocks = np.diff(np.concatenate(([0], np.cumsum(col_nnz)))[col_cuts])
+        nnz = min(int(row_blocks.max(initial=0)), int(col_blocks.max(initial=0)), Nt*Kt)
+        if(fmt_type == 4):
+            return [min(int(row_nnz.max(initial=0)), Kt)]*2 + [nnz]*3 + [2], Nt, Kt
+        if(fmt_type == 5):
+            num_slices = math.ceil(Nt / grid_generator.SELL_C)
+            length = num_slices*grid_generator.SELL_C*min(int(row_nnz.max(initial=0)), Kt)
+            return [length, length, num_slices, num_slices*grid_generator.SELL_C], Nt, Kt
+        if(fmt_type == 7 or fmt_type == 8):
+            degree, cuts = (row_nnz, row_cuts) if fmt_type == 7 else (col_nnz, col_cuts)
+            nonempty = max(min(int(np.diff(np.concatenate(([0], np.cumsum(degree > 0)))[cuts]).max(initial=0)), nnz), 1)
+            return [nnz, nnz, nonempty, nonempty+1], Nt, Kt
+        if(fmt_type == 9):
+            return [nnz, bitmap_words(Nt, Kt)], Nt, Kt
+        if(fmt_type == 10):
+            return [nm_slots(Nt, Kt, min(int(row_nnz.max(initial=0)), grid_generator.NM_M))]*2 + [2], Nt, Kt
+        return [nnz, nnz, {0: Kt+1, 1: Nt+1, 2: nnz, 6: Nt+1}[fmt_type]], Nt, Kt
+
+    rows = tile_store.expanded_positions(row_cuts, Nt)[rows]
+    cols = tile_store.expanded_positions(col_cuts, Kt)[cols]
+    grid = grid_generator.convert_to_grid(rows, cols, vals, height*Nt, width*Kt, height, width, fmt_type)
+
+    return [int(array.shape[1]) for array in grid.values()], Nt, Kt
+
+def memory_used_equalized(fmt_type, Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE with nnz-equalizing tile boundaries
+
+    The extent ratios of EXTENT_RATIOS are tried and the one that uses the least memory is kept. Longer blocks
+    enlarge B and C on every PE, in exchange the non-zeros of the tiles are equalized.
+
+    Parameters
+    ----------
+    fmt_type: 0: CSC, 1: CSR, 2: COO, 3: ELLPACK, 4: HYB, 5: SELL, 6: BSR, 7: DCSR, 8: DCSC, 9: BITMAP, 10: NM
+    Nt: dimension Nt = N / grid_height of the uniform tile boundaries
+    Kt: dimension Kt = K / grid_width of the uniform tile boundaries
+    M: dimension M
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    Memory in bytes being used per PE and the extent ratio that achieves it
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
 
-def get_nnz_csc(N, K, height, width, density):
+    # We first estimate the memory with the uniform tile boundaries so we can skip unnecessary computations
+    upper_nnz = Nt*Kt*(density/100)
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    # Pattern-only matrices drop the values of A in the formats that support them
+    A_value_words = a_value_words if fmt_type in PATTERN_FORMATS else value_words
+    mem_estimate = 4*(value_words(b_rows(Kt, fmt_type)*padded_M) + Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+                      + A_value_words(upper_nnz) + index_words(upper_nnz))
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate, EXTENT_RATIOS[0]
+
+    options = []
+    for extent_ratio in EXTENT_RATIOS:
+        lengths, Nt_max, Kt_max = get_equalized_lengths(int(Nt*height), int(Kt*width), height, width, density, fmt_type,
+                                                        generator, extent_ratio)
+        # ELLPACK stores Nt rows of A_len entries, HYB additionally its COO part and the split
+        value_arrays = (0, 2) if fmt_type == 4 else (0,)
+        mem_A = 0
+        for i, length in enumerate(lengths):
+            entries = Nt_max*length if fmt_type == 3 or (fmt_type == 4 and i < 2) else length
+            if i in value_arrays:
+                mem_A += A_value_words(entries)
+            else:
+                # The bitmap words of BITMAP are never packed
+                mem_A += entries if fmt_type == 9 else index_words(entries)
+        options.append((4*(value_words(b_rows(Kt_max, fmt_type)*padded_M) + Nt_max*padded_M
+                           + transposed_words(Nt_max, Kt_max, padded_M) + mem_A), extent_ratio))
+
+    return min(options)
+
+def get_nnz_csc(N, K, height, width, density, generator="uniform"):
     """Gets A_val_len, A_colidx_len, A_rowptr_len from a CSC formatted matrix.
 
     Parameters
@@ -30,21 +527,20 @@ def get_nnz_csc(N, K, height, width, density):
     height: grid height
     width: grid width
     density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz), uniform matrices are
+                          bounded by the analytical model (uniform_lengths)
 
     Returns
     -------
     A_len, A_colidx_len, A_rowptr_len for the submatrices defined by N x K and height x width PEs.
     """
 
-    # Generate the matrix format
-    retrieve_params = subprocess.check_output(f"./a.out {N} {K} {density} {height} {width} 0", shell=True, universal_newlines=True)
-
-    # Process the output of the second file
-    lines = retrieve_params.splitlines()
+    if(generator != "uniform" or SYMMETRIC):
+        return tuple(get_lengths(N, K, height, width, density, 0, generator))
 
-    return int(lines[0]), int(lines[1]), int(lines[2])
+    return uniform_lengths(N, K, height, width, density, 0)
 
-def memory_used_csc(Nt, Kt, M, density, width, height):
+def memory_used_csc(Nt, Kt, M, density, width, height, generator="uniform"):
     """Calculates the memory that is used per PE when using the grid CSC format
 
     Parameters
@@ -53,6 +549,7 @@ def memory_used_csc(Nt, Kt, M, density, width, height):
     Kt: dimension Kt = K / grid_width
     M: dimension M 
     density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
 
     Returns
     -------
@@ -63,9 +560,9 @@ def memory_used_csc(Nt, Kt, M, density, width, height):
     multiple = int(align/4)
     padded_M = math.ceil((M+1)/multiple)*multiple
 
-    # Get B and C sizes
-    mem_B = Kt*padded_M
-    mem_C = Nt*padded_M
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
 
     # We first estimate the memory so we can skip unnecessary computations
     upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
@@ -74,21 +571,21 @@ def memory_used_csc(Nt, Kt, M, density, width, height):
     mem_A_rowidx = upper_nnz
     mem_A_colptr = Kt+1
 
-    mem_estimate = 4*(mem_B+mem_C+mem_A_val+mem_A_colptr+mem_A_rowidx)
+    mem_estimate = 4*(mem_B+mem_C+a_value_words(mem_A_val)+index_words(mem_A_colptr)+index_words(mem_A_rowidx))
     if(mem_estimate > MEM-RESERVED):
         return mem_estimate
 
     # If estimated memory is within range, we do the actual computation
-    A_val_len, A_rowidx_len, A_colptr_len = get_nnz_csc(int(Nt*height), int(Kt*width), height, width, density)
+    A_val_len, A_rowidx_len, A_colptr_len = get_nnz_csc(int(Nt*height), int(Kt*width), height, width, density, generator)
 
     # Use actual sizes
     mem_A_val = A_val_len
     mem_A_rowidx = A_rowidx_len
     mem_A_colptr = A_colptr_len
 
-    return 4*(mem_B+mem_C+mem_A_val+mem_A_colptr+mem_A_rowidx)
+    return 4*(mem_B+mem_C+a_value_words(mem_A_val)+index_words(mem_A_colptr)+index_words(mem_A_rowidx))
 
-def get_nnz_csr(N, K, height, width, density):
+def get_nnz_csr(N, K, height, width, density, generator="uniform"):
     """Gets A_val_len, A_rowidx_len, A_colptr_len from a CSR formatted matrix.
 
     Parameters
@@ -98,21 +595,20 @@ def get_nnz_csr(N, K, height, width, density):
     height: grid height
     width: grid width
     density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz), uniform matrices are
+                          bounded by the analytical model (uniform_lengths)
 
     Returns
     -------
     A_len, A_rowidx_len, A_colptr_len for the submatrices defined by N x K and height x width PEs.
     """
 
-    # Generate the matrix format
-    retrieve_params = subprocess.check_output(f"./a.out {N} {K} {density} {height} {width} 1", shell=True, universal_newlines=True)
+    if(generator != "uniform" or SYMMETRIC):
+        return tuple(get_lengths(N, K, height, width, density, 1, generator))
 
-    # Process the output of the second file
-    lines = retrieve_params.splitlines()
+    return uniform_lengths(N, K, height, width, density, 1)
 
-    return int(lines[0]), int(lines[1]), int(lines[2])
-
-def memory_used_csr(Nt, Kt, M, density, width, height):
+def memory_used_csr(Nt, Kt, M, density, width, height, generator="uniform"):
     """Calculates the memory that is used per PE when using the grid CSR format
 
     Parameters
@@ -121,6 +617,7 @@ def memory_used_csr(Nt, Kt, M, density, width, height):
     Kt: dimension Kt = K / grid_width
     M: dimension M 
     density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
 
     Returns
     -------
@@ -131,32 +628,36 @@ def memory_used_csr(Nt, Kt, M, density, width, height):
     multiple = int(align/4)
     padded_M = math.ceil((M+1)/multiple)*multiple
 
-    # Get B and C sizes
-    mem_B = Kt*padded_M
-    mem_C = Nt*padded_M
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
 
     # We first estimate the memory so we can skip unnecessary computations
     upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
     upper_nnz -= upper_nnz*0.2 # Give some buffer
     mem_A_val = upper_nnz
-    mem_A_colidx = upper_nnz
     mem_A_rowptr = Nt+1
+    # Delta fields are at least one bit wide
+    mem_A_colidx = upper_nnz/32 if DELTA_INDICES else index_words(upper_nnz)
 
-    mem_estimate = 4*(mem_B+mem_C+mem_A_val+mem_A_rowptr+mem_A_colidx)
+    mem_estimate = 4*(mem_B+mem_C+a_value_words(mem_A_val)+index_words(mem_A_rowptr)+mem_A_colidx)
     if(mem_estimate > MEM-RESERVED):
         return mem_estimate
 
     # If estimated memory is within range, we do the actual computation
-    A_val_len, A_colidx_len, A_rowptr_len = get_nnz_csr(int(Nt*height), int(Kt*width), height, width, density)
+    A_val_len, A_colidx_len, A_rowptr_len = get_nnz_csr(int(Nt*height), int(Kt*width), height, width, density, generator)
 
     # Use actual sizes
     mem_A_val = A_val_len
-    mem_A_colidx = A_colidx_len
     mem_A_rowptr = A_rowptr_len
+    if DELTA_INDICES:
+        mem_A_colidx = get_delta_words(int(Nt*height), int(Kt*width), height, width, density, 1, generator)
+    else:
+        mem_A_colidx = index_words(A_colidx_len)
 
-    return 4*(mem_B+mem_C+mem_A_val+mem_A_rowptr+mem_A_colidx)
+    return 4*(mem_B+mem_C+a_value_words(mem_A_val)+index_words(mem_A_rowptr)+mem_A_colidx)
 
-def get_nnz_coo(N, K, height, width, density):
+def get_nnz_coo(N, K, height, width, density, generator="uniform"):
     """Gets A_len from a COO formatted matrix.
 
     Parameters
@@ -166,21 +667,20 @@ def get_nnz_coo(N, K, height, width, density):
     height: grid height
     width: grid width
     density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz), uniform matrices are
+                          bounded by the analytical model (uniform_lengths)
 
     Returns
     -------
     A_len for the submatrices defined by N x K and height x width PEs.
     """
 
-    # Generate the matrix format
-    retrieve_params = subprocess.check_output(f"./a.out {N} {K} {density} {height} {width} 2", shell=True, universal_newlines=True)
-
-    # Process the output of the second file
-    lines = retrieve_params.splitlines()
+    if(generator != "uniform" or SYMMETRIC):
+        return get_lengths(N, K, height, width, density, 2, generator)[0]
 
-    return int(lines[0])
+    return uniform_lengths(N, K, height, width, density, 2)[0]
 
-def memory_used_coo(Nt, Kt, M, density, width, height):
+def memory_used_coo(Nt, Kt, M, density, width, height, generator="uniform"):
     """Calculates the memory that is used per PE when using the grid COO format
 
     Parameters
@@ -189,6 +689,7 @@ def memory_used_coo(Nt, Kt, M, density, width, height):
     Kt: dimension Kt = K / grid_width
     M: dimension M 
     density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
 
     Returns
     -------
@@ -199,9 +700,9 @@ def memory_used_coo(Nt, Kt, M, density, width, height):
     multiple = int(align/4)
     padded_M = math.ceil((M+1)/multiple)*multiple
 
-    # Get B and C sizes
-    mem_B = Kt*padded_M
-    mem_C = Nt*padded_M
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(b_rows(Kt, 2)*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
 
     # We first estimate the memory so we can skip unnecessary computations
     upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
@@ -210,21 +711,21 @@ def memory_used_coo(Nt, Kt, M, density, width, height):
     mem_A_x = upper_nnz
     mem_A_y = upper_nnz
 
-    mem_estimate = 4*(mem_B+mem_C+mem_A_val+mem_A_x+mem_A_y)
+    mem_estimate = 4*(mem_B+mem_C+a_value_words(mem_A_val)+index_words(mem_A_x)+index_words(mem_A_y))
     if(mem_estimate > MEM-RESERVED):
         return mem_estimate
 
     # If estimated memory is within range, we do the actual computation
-    A_len = get_nnz_coo(int(Nt*height), int(Kt*width), height, width, density)
+    A_len = get_nnz_coo(int(Nt*height), int(Kt*width), height, width, density, generator)
 
     # Use actual A_len
     mem_A_val = A_len
     mem_A_x = A_len
     mem_A_y = A_len
 
-    return 4*(mem_B+mem_C+mem_A_val+mem_A_x+mem_A_y)
+    return 4*(mem_B+mem_C+a_value_words(mem_A_val)+index_words(mem_A_x)+index_words(mem_A_y))
 
-def get_nnz_ellpack(N, K, height, width, density):
+def get_nnz_ellpack(N, K, height, width, density, generator="uniform"):
     """Gets A_len from a ELLPACK formatted matrix.
 
     Parameters
@@ -234,21 +735,20 @@ def get_nnz_ellpack(N, K, height, width, density):
     height: grid height
     width: grid width
     density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz), uniform matrices are
+                          bounded by the analytical model (uniform_lengths)
 
     Returns
     -------
     A_len for the submatrices defined by N x K and height x width PEs.
     """
 
-    # Generate the matrix format
-    retrieve_params = subprocess.check_output(f"./a.out {N} {K} {density} {height} {width} 3", shell=True, universal_newlines=True)
+    if(generator != "uniform" or SYMMETRIC):
+        return get_lengths(N, K, height, width, density, 3, generator)[0]
 
-    # Process the output of the second file
-    lines = retrieve_params.splitlines()
+    return uniform_lengths(N, K, height, width, density, 3)[0]
 
-    return int(lines[0])
-
-def memory_used_ellpack(Nt, Kt, M, density, width, height):
+def memory_used_ellpack(Nt, Kt, M, density, width, height, generator="uniform"):
     """Calculates the memory that is used per PE when using the grid ellpack format
 
     Parameters
@@ -257,6 +757,7 @@ def memory_used_ellpack(Nt, Kt, M, density, width, height):
     Kt: dimension Kt = K / grid_width
     M: dimension M 
     density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
 
     Returns
     -------
@@ -267,30 +768,517 @@ def memory_used_ellpack(Nt, Kt, M, density, width, height):
     multiple = int(align/4)
     padded_M = math.ceil((M+1)/multiple)*multiple
 
-    # Get B and C sizes
-    mem_B = Kt*padded_M
-    mem_C = Nt*padded_M
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(b_rows(Kt, 3)*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
 
     # We first estimate the memory so we can skip unnecessary computations
     upper_nnz = Kt*(density/100) # calculate the mean nnz IN ONE ROW!
     upper_nnz -= upper_nnz*0.2 # Give some buffer
     mem_A_val = Nt*upper_nnz
-    mem_A_indices = Nt*upper_nnz
+    # Delta fields are at least one bit wide
+    mem_A_indices = Nt*upper_nnz/32 if DELTA_INDICES else index_words(Nt*upper_nnz)
 
-    mem_estimate = 4*(mem_B+mem_C+mem_A_val+mem_A_indices)
+    mem_estimate = 4*(mem_B+mem_C+a_value_words(mem_A_val)+mem_A_indices)
     if(mem_estimate > MEM-RESERVED):
         return mem_estimate
 
     # If estimated memory is within range, we do the actual computation
-    A_len = get_nnz_ellpack(int(Nt*height), int(Kt*width), height, width, density)
+    A_len = get_nnz_ellpack(int(Nt*height), int(Kt*width), height, width, density, generator)
     
     # Use actual A_len
     mem_A_val = Nt*A_len
-    mem_A_indices = Nt*A_len
+    if DELTA_INDICES:
+        mem_A_indices = get_delta_words(int(Nt*height), int(Kt*width), height, width, density, 3, generator)
+    else:
+        mem_A_indices = index_words(Nt*A_len)
+
+    return 4*(mem_B+mem_C+a_value_words(mem_A_val)+mem_A_indices)
+
+def get_nnz_hyb(N, K, height, width, density, generator="uniform"):
+    """Gets A_ell_len, A_coo_len from a HYB formatted matrix.
+
+    convertor.c does not know the HYB format, so uniform matrices are converted in-process as well.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_ell_len (ELLPACK width), A_coo_len for the submatrices defined by N x K and height x width PEs.
+    """
+    lengths = get_lengths(N, K, height, width, density, 4, generator)
+
+    return lengths[0], lengths[2]
+
+def memory_used_hyb(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid HYB format
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # We first estimate the memory so we can skip unnecessary computations (HYB stores at least every non-zero once)
+    upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    mem_A = value_words(upper_nnz) + index_words(upper_nnz)
+
+    mem_estimate = 4*(mem_B+mem_C+mem_A)
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate
+
+    # If estimated memory is within range, we do the actual computation
+    A_ell_len, A_coo_len = get_nnz_hyb(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    # ELLPACK part: Nt rows of A_ell_len values and indices, COO part: values, columns and rows, split: 2 entries
+    mem_A = value_words(Nt*A_ell_len) + index_words(Nt*A_ell_len) + value_words(A_coo_len) + 2*index_words(A_coo_len) + index_words(2)
+
+    return 4*(mem_B+mem_C+mem_A)
+
+def get_nnz_sell(N, K, height, width, density, generator="uniform"):
+    """Gets A_len, num_slices and the slots of the slices from a SELL formatted matrix.
+
+    convertor.c does not know the SELL format, so uniform matrices are converted in-process as well.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_len, num_slices, num_slots for the submatrices defined by N x K and height x width PEs.
+    """
+    lengths = get_lengths(N, K, height, width, density, 5, generator)
+
+    return lengths[0], lengths[2], lengths[3]
+
+def memory_used_sell(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid sliced ELLPACK format (SELL-C-sigma)
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # We first estimate the memory so we can skip unnecessary computations (SELL stores at least every non-zero once)
+    upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    mem_A = value_words(upper_nnz) + index_words(upper_nnz)
+
+    mem_estimate = 4*(mem_B+mem_C+mem_A)
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate
+
+    # If estimated memory is within range, we do the actual computation
+    A_len, num_slices, num_slots = get_nnz_sell(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    # Values and indices of the slices, the width of every slice and the row of every slot
+    mem_A = value_words(A_len) + index_words(A_len) + index_words(num_slices) + index_words(num_slots)
+
+    return 4*(mem_B+mem_C+mem_A)
+
+def get_nnz_bsr(N, K, height, width, density, generator="uniform"):
+    """Gets A_val_len, A_colidx_len, A_rowptr_len from a BSR formatted matrix.
+
+    convertor.c does not know the BSR format, so uniform matrices are converted in-process as well.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_val_len, A_colidx_len, A_rowptr_len for the submatrices defined by N x K and height x width PEs.
+    """
+    return get_lengths(N, K, height, width, density, 6, generator)
+
+def memory_used_bsr(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid block-sparse format (BSR)
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # We first estimate the memory so we can skip unnecessary computations (BSR stores at least every non-zero once)
+    upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    mem_A = value_words(upper_nnz)
+
+    mem_estimate = 4*(mem_B+mem_C+mem_A)
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate
+
+    # If estimated memory is within range, we do the actual computation
+    A_val_len, A_colidx_len, A_rowptr_len = get_nnz_bsr(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    mem_A = value_words(A_val_len) + index_words(A_colidx_len) + index_words(A_rowptr_len)
+
+    return 4*(mem_B+mem_C+mem_A)
+
+def get_nnz_dcsr(N, K, height, width, density, generator="uniform"):
+    """Gets A_val_len, A_colidx_len, A_rowids_len, A_rowptr_len from a DCSR formatted matrix.
+
+    convertor.c does not know the DCSR format, so uniform matrices are converted in-process as well.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_val_len, A_colidx_len, A_rowids_len, A_rowptr_len for the submatrices defined by N x K and height x width PEs.
+    """
+    return tuple(get_lengths(N, K, height, width, density, 7, generator))
+
+def memory_used_dcsr(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid doubly-compressed CSR format (DCSR)
+
+    Only the non-empty rows of a tile are stored, which saves most of the CSR pointers on fine grids.
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # We first estimate the memory so we can skip unnecessary computations (a tile has at most one non-empty
+    # row per non-zero)
+    upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    mem_A_val = upper_nnz
+    mem_A_colidx = upper_nnz
+    mem_A_rowids = min(Nt, upper_nnz)
+    mem_A_rowptr = mem_A_rowids+1
+
+    mem_estimate = 4*(mem_B+mem_C+value_words(mem_A_val)+index_words(mem_A_colidx)+index_words(mem_A_rowids)+index_words(mem_A_rowptr))
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate
+
+    # If estimated memory is within range, we do the actual computation
+    A_val_len, A_colidx_len, A_rowids_len, A_rowptr_len = get_nnz_dcsr(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    # Use actual sizes
+    mem_A_val = A_val_len
+    mem_A_colidx = A_colidx_len
+    mem_A_rowids = A_rowids_len
+    mem_A_rowptr = A_rowptr_len
+
+    return 4*(mem_B+mem_C+value_words(mem_A_val)+index_words(mem_A_colidx)+index_words(mem_A_rowids)+index_words(mem_A_rowptr))
+
+def get_nnz_dcsc(N, K, height, width, density, generator="uniform"):
+    """Gets A_val_len, A_rowidx_len, A_colids_len, A_colptr_len from a DCSC formatted matrix.
+
+    convertor.c does not know the DCSC format, so uniform matrices are converted in-process as well.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_val_len, A_rowidx_len, A_colids_len, A_colptr_len for the submatrices defined by N x K and height x width PEs.
+    """
+    return tuple(get_lengths(N, K, height, width, density, 8, generator))
+
+def memory_used_dcsc(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid doubly-compressed CSC format (DCSC)
+
+    Only the non-empty columns of a tile are stored, which saves most of the CSC pointers on fine grids.
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # We first estimate the memory so we can skip unnecessary computations (a tile has at most one non-empty
+    # column per non-zero)
+    upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    mem_A_val = upper_nnz
+    mem_A_rowidx = upper_nnz
+    mem_A_colids = min(Kt, upper_nnz)
+    mem_A_colptr = mem_A_colids+1
+
+    mem_estimate = 4*(mem_B+mem_C+value_words(mem_A_val)+index_words(mem_A_rowidx)+index_words(mem_A_colids)+index_words(mem_A_colptr))
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate
+
+    # If estimated memory is within range, we do the actual computation
+    A_val_len, A_rowidx_len, A_colids_len, A_colptr_len = get_nnz_dcsc(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    # Use actual sizes
+    mem_A_val = A_val_len
+    mem_A_rowidx = A_rowidx_len
+    mem_A_colids = A_colids_len
+    mem_A_colptr = A_colptr_len
+
+    return 4*(mem_B+mem_C+value_words(mem_A_val)+index_words(mem_A_rowidx)+index_words(mem_A_colids)+index_words(mem_A_colptr))
+
+def get_nnz_bitmap(N, K, height, width, density, generator="uniform"):
+    """Gets A_val_len, A_bitmap_len from a BITMAP formatted matrix.
+
+    The values are padded like the values of CSR, so uniform matrices reuse the CSR lengths of the analytical model.
+
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_val_len, A_bitmap_len for the submatrices defined by N x K and height x width PEs.
+    """
+    if(generator != "uniform" or SYMMETRIC):
+        return tuple(get_lengths(N, K, height, width, density, 9, generator))
+
+    A_val_len, _, _ = get_nnz_csr(N, K, height, width, density, generator)
+
+    return A_val_len, bitmap_words(math.ceil(N/height), math.ceil(K/width))
+
+def memory_used_bitmap(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid bitmap format
+
+    The bitmap costs one bit per position of a tile instead of one index per non-zero and a row pointer array.
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # We first estimate the memory so we can skip unnecessary computations
+    upper_nnz = Nt*Kt*(density/100) # calculate the mean nnz
+    upper_nnz -= upper_nnz*0.2 # Give some buffer
+    mem_A_val = upper_nnz
+    mem_A_bitmap = bitmap_words(Nt, Kt)
+
+    mem_estimate = 4*(mem_B+mem_C+value_words(mem_A_val)+mem_A_bitmap)
+    if(mem_estimate > MEM-RESERVED):
+        return mem_estimate
+
+    # If estimated memory is within range, we do the actual computation
+    A_val_len, A_bitmap_len = get_nnz_bitmap(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    # Use actual sizes
+    mem_A_val = A_val_len
+    mem_A_bitmap = A_bitmap_len
+
+    return 4*(mem_B+mem_C+value_words(mem_A_val)+mem_A_bitmap)
+
+def get_nnz_nm(N, K, height, width, density, generator="uniform"):
+    """Gets A_val_len, A_offsets_len, A_pattern_len from a NM formatted matrix.
 
-    return 4*(mem_B+mem_C+mem_A_val+mem_A_indices)
+    Uniform random matrices do not follow an N:M pattern, so "uniform" plans the N:M structured matrices of the nm
+    generator instead. Every group holds exactly nm_entries(density) slots, the lengths follow without a matrix.
 
-def memory_used_gemm(Nt, Kt, M, density, width, height):
+    Parameters
+    ----------
+    N: row dimension
+    K: column dimension
+    height: grid height
+    width: grid width
+    density: density of the matrix A
+    generator (optional): matrix generator or node degrees of a graph (<prefix>_degrees.npz)
+
+    Returns
+    -------
+    A_val_len, A_offsets_len, A_pattern_len for the submatrices defined by N x K and height x width PEs.
+    """
+    if(generator != "uniform" or SYMMETRIC):
+        return tuple(get_lengths(N, K, height, width, density, 10, generator))
+
+    A_val_len = nm_slots(math.ceil(N/height), math.ceil(K/width), grid_generator.nm_entries(density))
+
+    return A_val_len, A_val_len, 2
+
+def memory_used_nm(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE when using the grid N:M format
+
+    The offsets cost one index per slot, the pattern [n, m] is shared by all groups of a tile.
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform" plans N:M structured matrices, "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    # Calculate alignment and padding of M in implementation
+    align = 16
+    multiple = int(align/4)
+    padded_M = math.ceil((M+1)/multiple)*multiple
+
+    # Get B and C sizes, C includes B_T and C_T of the transposed pass of symmetric matrices
+    mem_B = value_words(Kt*padded_M)
+    mem_C = Nt*padded_M + transposed_words(Nt, Kt, padded_M)
+
+    # The lengths of N:M structured matrices are computed directly, there is no estimate to skip
+    A_val_len, A_offsets_len, A_pattern_len = get_nnz_nm(int(Nt*height), int(Kt*width), height, width, density, generator)
+
+    # Use actual sizes
+    mem_A_val = A_val_len
+    mem_A_offsets = A_offsets_len
+    mem_A_pattern = A_pattern_len
+
+    return 4*(mem_B+mem_C+value_words(mem_A_val)+index_words(mem_A_offsets)+index_words(mem_A_pattern))
+
+def csr_or_bitmap(Nt, Kt, density):
+    """Chooses the row-major format of a tile: BITMAP (9) if its Nt*ceil(Kt/32) words are smaller than the index
+    arrays of CSR (one column index per mean non-zero and Nt+1 row pointers), otherwise CSR (1)"""
+    mean_nnz = Nt*Kt*(density/100)
+    return 9 if bitmap_words(Nt, Kt) < index_words(mean_nnz) + index_words(Nt+1) else 1
+
+def memory_used_csr_bitmap(Nt, Kt, M, density, width, height, generator="uniform"):
+    """Calculates the memory that is used per PE with the row-major format chosen by csr_or_bitmap
+
+    Parameters
+    ----------
+    Nt: dimension Nt = N / grid_height
+    Kt: dimension Kt = K / grid_width
+    M: dimension M 
+    density: density of the matrix A
+    generator (optional): matrix generator ("uniform", "rmat", "kronecker" or "chung-lu")
+
+    Returns
+    -------
+    Memory in bytes being used per PE
+    """
+    if(csr_or_bitmap(Nt, Kt, density) == 9):
+        return memory_used_bitmap(Nt, Kt, M, density, width, height, generator)
+    return memory_used_csr(Nt, Kt, M, density, width, height, generator)
+
+def memory_used_gemm(Nt, Kt, M, density, width, height, generator="uniform"):
     """Calculates the memory that is used per PE when using GEMM
 
     Parameters
@@ -299,6 +1287,7 @@ def memory_used_gemm(Nt, Kt, M, density, width, height):
     Kt: dimension Kt = K / grid_width
     M: dimension M 
     density: density of the matrix A
+    generator (optional): unused, GEMM stores A densely
 
     Returns
     -------
@@ -317,11 +1306,75 @@ def memory_used_gemm(Nt, Kt, M, density, width, height):
 
     return 4*(mem_B+mem_C+mem_A)
 
+# Memory models of the formats that main() plans, CSR_BITMAP plans every tile with CSR or BITMAP (see csr_or_bitmap)
+PLANNERS = {
+    "CSC": memory_used_csc,
+    "CSR": memory_used_csr,
+    "COO": memory_used_coo,
+    "ELLPACK": memory_used_ellpack,
+    "HYB": memory_used_hyb,
+    "SELL": memory_used_sell,
+    "BSR": memory_used_bsr,
+    "DCSR": memory_used_dcsr,
+    "DCSC": memory_used_dcsc,
+    "BITMAP": memory_used_bitmap,
+    "NM": memory_used_nm,
+    "CSR_BITMAP": memory_used_csr_bitmap,
+    "GEMM": memory_used_gemm,
+}
+
 def main():
-    density_list = [5, 10, 20, 30]
-    NK_list = [(768, 768) , (3072, 768), (768, 3072), (1024,1024), (4096, 1024), (1024, 4096)]
+    global INDEX_BITS, VALUE_BITS, PATTERN_ONLY, DELTA_INDICES, SYMMETRIC, EXACT_LENGTHS, CONVERTOR_LENGTHS
+
+    # The commands that produced the FORMAT*_params.txt files are listed in plan_params.sh
+    parser = argparse.ArgumentParser(description="Plans the grid and M of every problem size and density")
+    parser.add_argument("format", nargs="?", default="ELLPACK", choices=PLANNERS, help="format whose memory model is planned")
+    parser.add_argument("-densities", type=int, nargs="+", default=[5, 10, 20, 30],
+                        help="densities of A in percent (plan NM with the densities 25, 50, 75 of the 1:4, 2:4, 3:4 patterns)")
+    parser.add_argument("-generator", default="uniform",
+                        help="matrix generator (\"uniform\", \"rmat\", \"kronecker\" or \"chung-lu\") or the node degrees of a graph "
+                             "written by edge_list.py (\"<prefix>_degrees.npz\")")
+    parser.add_argument("-NK", type=int, nargs=2, action="append", help="problem size N K (repeatable), e.g. the nodes of a graph")
+    parser.add_argument("-index_bits", type=int, choices=(16, 32), default=INDEX_BITS, help="width of the index entries of A")
+    parser.add_argument("-value_bits", type=int, choices=(16, 32), default=VALUE_BITS, help="width of the values of A and B")
+    parser.add_argument("-pattern_only", action="store_true", default=PATTERN_ONLY, help="drop the values of A (CSC, CSR, COO, ELLPACK)")
+    parser.add_argument("-delta_indices", action="store_true", default=DELTA_INDICES, help="bit-packed delta column indices (CSR, ELLPACK)")
+    parser.add_argument("-symmetric", action="store_true", default=SYMMETRIC, help="only store the upper triangle of tiles")
+    parser.add_argument("-equalize", action="store_true", help="plan the nnz-equalizing tile boundaries (memory_used_equalized)")
+    parser.add_argument("-exact_lengths", action="store_true", default=EXACT_LENGTHS, help="see EXACT_LENGTHS")
+    parser.add_argument("-convertor_lengths", action="store_true", default=CONVERTOR_LENGTHS, help="see CONVERTOR_LENGTHS")
+    parser.add_argument("-validate_model", action="store_true", default=VALIDATE_MODEL, help="see VALIDATE_MODEL")
+    args = parser.parse_args()
+
+    # The memory models read the modes from the module
+    INDEX_BITS, VALUE_BITS = args.index_bits, args.value_bits
+    PATTERN_ONLY, DELTA_INDICES, SYMMETRIC = args.pattern_only, args.delta_indices, args.symmetric
+    EXACT_LENGTHS, CONVERTOR_LENGTHS = args.exact_lengths, args.convertor_lengths
+
+    memory_used = PLANNERS[args.format]
+    if args.equalize:
+        if args.format not in grid_generator.FORMAT_NAMES.values():
+            parser.error(f"-equalize plans the grid formats {list(grid_generator.FORMAT_NAMES.values())}")
+        # It returns (memory, extent ratio), the extent ratio is printed as extent_ratios and passed to vector_cache.py with -equalize
+        fmt_type = {name: fmt for fmt, name in grid_generator.FORMAT_NAMES.items()}[args.format]
+        memory_used = functools.partial(memory_used_equalized, fmt_type)
+
+    density_list = args.densities
+    generator = args.generator
+    NK_list = [tuple(NK) for NK in args.NK] if args.NK else [(768, 768) , (3072, 768), (768, 3072), (1024,1024), (4096, 1024), (1024, 4096)]
+
+    if args.validate_model:
+        # Grids whose exact tile, row or column exceeds the bound of the model and the overestimate of the tile nnz
+        for density in density_list:
+            for (N,K) in NK_list:
+                results = validate_model(N, K, density)
+                exceeded = [sum(model[i] < exact[i] for _, _, model, exact in results) for i in range(3)]
+                overestimate = max(model[0]/max(exact[0], 1) for _, _, model, exact in results)
+                print(f"N={N} K={K} density={density}: tile/row/column exceed the model on {exceeded[0]}/{exceeded[1]}/{exceeded[2]} of {len(results)} grids, tile nnz overestimated by up to {100*(overestimate-1):.1f}%")
+        return
 
     f_out = []
+    equalized = False
 
     for density in tqdm(density_list):
         for (N,K) in tqdm(NK_list, leave=False):
@@ -330,24 +1383,24 @@ def main():
             grid_height_list = [i for i in range(1, AVAIL_HEIGHT) if N % i == 0]
             grid_width_list = [i for i in range(1, AVAIL_WIDTH) if K % i == 0]
             zipped = list(itertools.product(grid_height_list,grid_width_list))
+            if SYMMETRIC:
+                # Symmetric tile stores need a square matrix on a square grid
+                zipped = [(h, w) for (h, w) in zipped if N == K and h == w]
 
             for M in tqdm([32, 64, 128, 256, 512, 768, 1024, 2048, 4096], leave=False):
 
-                # [IMPORTANT]: Change which format is used here:
-                # Options:
-                # memory_used_coo
-                # memory_used_csc
-                # memory_used_csr
-                # memory_used_ellpack
-                # memory_used_gemm
-                # If GEMM is used, comment out lines 364-366 and comment lines 370-372!
-                mem_used = [memory_used_ellpack(int(N/h), int(K/w), M, density, w, h) for (h,w) in zipped]
+                mem_used = [memory_used(int(N/h), int(K/w), M, density, w, h, generator) for (h,w) in zipped]
+
+                # Split the (memory, extent ratio) of the equalized planners, the uniform boundaries have the ratio 1
+                equalized = equalized or any(isinstance(mem, tuple) for mem in mem_used)
+                extent_ratios = [mem[1] if isinstance(mem, tuple) else 1.0 for mem in mem_used]
+                mem_used = [mem[0] if isinstance(mem, tuple) else mem for mem in mem_used]
 
                 grid_height_list = [x[0] for x in zipped]
                 grid_width_list = [x[1] for x in zipped]
 
                 # Get configs that fit in a PE
-                configs = [(mem_used[i], grid_height_list[i], grid_width_list[i], (N/grid_height_list[i])*(K/grid_width_list[i]), int(M)) for i in range(len(grid_width_list)) if mem_used[i] < MEM-RESERVED]
+                configs = [(mem_used[i], grid_height_list[i], grid_width_list[i], (N/grid_height_list[i])*(K/grid_width_list[i]), int(M), extent_ratios[i]) for i in range(len(grid_width_list)) if mem_used[i] < MEM-RESERVED]
                 
                 if(len(configs) == 0):
                     continue
@@ -358,18 +1411,19 @@ def main():
                 for config in configs:
                     mem = config[0]
                     if mem_max - (mem_max*0.05) < mem:
-                        output.append((mem, config[1], config[2], config[3], config[4]))
-
-            ############################ GEMM #################################
-            # Sort by Nt x Kt first (4th element) and extract highest amount
-            # max_ntkt = sorted(output, key=itemgetter(3))[-1][3]
-            # ntkt_config = [c for c in output if c[3]==max_ntkt]
-
-            ############################ SpMM #################################
-            # Extract all configs with high enough non-zeroes
-            BOUND = 64
-            dens_perc = density/100
-            ntkt_config = [c for c in output if BOUND<=(c[3]*dens_perc)]
+                        output.append(config)
+
+            if args.format == "GEMM":
+                ############################ GEMM #################################
+                # Sort by Nt x Kt first (4th element) and extract highest amount
+                max_ntkt = sorted(output, key=itemgetter(3))[-1][3]
+                ntkt_config = [c for c in output if c[3]==max_ntkt]
+            else:
+                ############################ SpMM #################################
+                # Extract all configs with high enough non-zeroes
+                BOUND = 64
+                dens_perc = density/100
+                ntkt_config = [c for c in output if BOUND<=(c[3]*dens_perc)]
 
             # Sort by memory used and choose largest
             best_config = sorted(ntkt_config, key=itemgetter(0))[-1]
@@ -380,15 +1434,15 @@ def main():
             for config in ntkt_config:
                 mem = config[0]
                 if mem_max - (mem_max*0.05) < mem:
-                    result.append((mem, config[1], config[2], config[3], config[4]))
+                    result.append(config)
 
             # Sort by M and extract highest M
             max_M = sorted(result, key=itemgetter(4))[-1][4]
             final_output = [c for c in result if max_M==c[4]]
 
             # If there are multiple ones, just use first option
-            _, h, w, _, m = final_output[0]
-            f_out.append([N, K, density, h, w, m])
+            _, h, w, _, m, extent_ratio = final_output[0]
+            f_out.append([N, K, density, h, w, m, extent_ratio])
 
     # Print final output
     print(f"A_heights=({' '.join([str(x[0]) for x in f_out])})")
@@ -397,12 +1451,8 @@ def main():
     print(f"grid_h=({' '.join([str(x[3]) for x in f_out])})")
     print(f"grid_w=({' '.join([str(x[4]) for x in f_out])})")
     print(f"M_w=({' '.join([str(x[5]) for x in f_out])})")
+    if equalized:
+        print(f"extent_ratios=({' '.join([str(x[6]) for x in f_out])})")
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-